@@ -1,16 +1,23 @@
 from fastapi import APIRouter, Depends
 
+from app.api.v1.caching import invalidate_on_write
 from app.api.v1.endpoints import exams, masters, questions, security, test_series, tests
+from app.security.api_keys import api_key_scheme
 from app.security.rate_limit import RateLimiter
 
-# Default per-key limiter applied to all protected routers
+# Default per-key limiter for the core domain routers, enforced (with X-API-Key auth) by
+# RateLimitMiddleware in app.main for everything under the API prefix except these paths.
 default_limiter = RateLimiter(limit=60, window_seconds=60)
+RATE_LIMIT_EXEMPT_PATHS = ("/public/", "/secure/", "/admin/")
 
 api_router = APIRouter()
-# Apply X-API-Key + rate limit to core domain routers
-api_router.include_router(masters.router, tags=["masters"], dependencies=[Depends(default_limiter)])
-api_router.include_router(exams.router, tags=["exams"], dependencies=[Depends(default_limiter)])
-api_router.include_router(questions.router, tags=["questions"], dependencies=[Depends(default_limiter)])
-api_router.include_router(test_series.router, tags=["test-series"], dependencies=[Depends(default_limiter)])
-api_router.include_router(tests.router, tags=["tests"], dependencies=[Depends(default_limiter)])
+# Writes through the core domain routers invalidate cached GET responses; api_key_scheme only documents
+# the X-API-Key header the middleware enforces.
+_domain_dependencies = [Depends(api_key_scheme), Depends(invalidate_on_write)]
+api_router.include_router(masters.router, tags=["masters"], dependencies=_domain_dependencies)
+api_router.include_router(exams.router, tags=["exams"], dependencies=_domain_dependencies)
+api_router.include_router(questions.router, tags=["questions"], dependencies=_domain_dependencies)
+api_router.include_router(test_series.router, tags=["test-series"], dependencies=_domain_dependencies)
+api_router.include_router(tests.router, tags=["tests"], dependencies=_domain_dependencies)
+# Security routes apply their own guards/limiters
 api_router.include_router(security.router, tags=["security"])
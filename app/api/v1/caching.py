@@ -0,0 +1,191 @@
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic_core import to_json
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+from app.db.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+_GENERATION_KEY = "rc:generation"
+
+
+class ResponseCache:
+    """
+    TTL cache of rendered GET response bodies keyed by path + sorted query string.
+
+    Bodies are kept in Redis when MQDB_REDIS_URL is set (so every worker sees the same entries
+    and invalidations), otherwise in process memory. Any write through the API drops the whole
+    cache: writes are rare next to reads, and coarse invalidation cannot miss a dependent
+    resource such as a test preview embedding an edited question.
+
+    Entries belong to a generation that clear() advances. In Redis each entry is its own key,
+    `rc:<generation>:<path?query>`, set with an expiry, so superseded generations simply age
+    out. A body loaded before a clear() is stored under the old generation, where no reader
+    looks, instead of being served stale for a full TTL.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, max_entries: int = 1024, redis_client: Optional[Redis] = None) -> None:
+        self._ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._redis = redis_client
+        self._redis_resolved = redis_client is not None
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._entries: Dict[str, Tuple[float, bytes]] = {}
+
+    @property
+    def ttl(self) -> int:
+        """Entry lifetime in seconds; defaults to MQDB_RESPONSE_CACHE_TTL, read on first use."""
+
+        if self._ttl is None:
+            self._ttl = get_settings().response_cache_ttl_seconds
+        return self._ttl
+
+    @property
+    def shared(self) -> bool:
+        """True when entries live in Redis (calls then block on the network)."""
+
+        return self._get_redis() is not None
+
+    def generation(self) -> Optional[int]:
+        """Current generation, to snapshot before loading a body; None if Redis is unreachable."""
+
+        client = self._get_redis()
+        if client is not None:
+            try:
+                return int(client.get(_GENERATION_KEY) or 0)
+            except RedisError as exc:
+                logger.warning("Response cache read failed: %s", exc)
+                return None
+        return self._generation
+
+    def lookup(self, key: str) -> Tuple[Optional[int], Optional[bytes]]:
+        """Return the current generation and the body cached for ``key`` in it (None on a miss)."""
+
+        generation = self.generation()
+        if generation is None:
+            return None, None
+        return generation, self.get(key, generation)
+
+    def get(self, key: str, generation: int) -> Optional[bytes]:
+        client = self._get_redis()
+        if client is not None:
+            try:
+                return client.get(f"rc:{generation}:{key}")
+            except RedisError as exc:
+                logger.warning("Response cache read failed: %s", exc)
+                return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic() or generation != self._generation:
+                return None
+            return entry[1]
+
+    def set(self, key: str, body: bytes, generation: int) -> None:
+        """Store ``body`` unless the cache was cleared after ``generation`` was read."""
+
+        client = self._get_redis()
+        if client is not None:
+            try:
+                client.set(f"rc:{generation}:{key}", body, ex=self.ttl)
+            except RedisError as exc:
+                logger.warning("Response cache write failed: %s", exc)
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.max_entries:
+                # Dicts keep insertion order, so the first key is the oldest entry.
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (time.monotonic() + self.ttl, body)
+
+    def clear(self) -> None:
+        client = self._get_redis()
+        if client is not None:
+            try:
+                client.incr(_GENERATION_KEY)
+            except RedisError as exc:
+                logger.warning("Response cache invalidation failed: %s", exc)
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def _get_redis(self) -> Optional[Redis]:
+        if not self._redis_resolved:
+            self._redis = get_redis()
+            self._redis_resolved = True
+        return self._redis
+
+
+response_cache = ResponseCache()
+
+
+def _etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+async def cached_response(request: Request, load: Callable[[], Awaitable[Any]]) -> Response:
+    """
+    Serve a read-mostly GET from the response cache, with ETag/304 support.
+
+    ``load`` produces the payload (a model, list or dict) on a cache miss; errors it
+    raises propagate untouched and are never cached.
+    """
+
+    key = request.url.path
+    if request.url.query:
+        # Sorted so ?status=published&limit=20 and ?limit=20&status=published share one entry.
+        key = f"{key}?{urlencode(sorted(request.query_params.multi_items()))}"
+    cache = response_cache
+    shared = cache.shared
+    # The generation is snapshotted before loading: a write that clears the cache meanwhile
+    # makes set() a no-op, so a pre-write body is never served after the write.
+    generation, body = await run_in_threadpool(cache.lookup, key) if shared else cache.lookup(key)
+    if body is None:
+        body = to_json(await load(), by_alias=True)
+        if generation is not None:
+            if shared:
+                await run_in_threadpool(cache.set, key, body, generation)
+            else:
+                cache.set(key, body, generation)
+
+    etag = _etag(body)
+    # Responses sit behind X-API-Key, so only the caller's own cache may store them.
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={cache.ttl}, stale-while-revalidate=30"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+async def invalidate_on_write(request: Request) -> AsyncIterator[None]:
+    """Router dependency dropping cached responses after any non-GET request, even one that fails."""
+
+    try:
+        yield
+    finally:
+        # A write can change data and then raise (e.g. a validation error after a partial update).
+        if request.method not in ("GET", "HEAD", "OPTIONS"):
+            if response_cache.shared:
+                await run_in_threadpool(response_cache.clear)
+            else:
+                response_cache.clear()
@@ -1,8 +1,11 @@
 from typing import List
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.concurrency import run_in_threadpool
 
-from app.db.session import Database, get_db
+from app.api.v1.caching import cached_response
+from app.api.v1.responses import documented, model_response
+from app.db.session import Database, provide_db
 from app.schemas.exam import ExamCreate, ExamResponse, ExamSyllabusItem, ExamUpdate
 from app.services.exam_service import create_exam, delete_exam, get_exam, get_exam_syllabus, list_exams, update_exam
 
@@ -10,33 +13,33 @@ router = APIRouter()
 
 
 @router.post("/exams", response_model=ExamResponse)
-def create_exam_endpoint(payload: ExamCreate, db: Database = Depends(get_db)) -> ExamResponse:
-    return create_exam(payload, db)
+async def create_exam_endpoint(payload: ExamCreate, db: Database = Depends(provide_db)) -> ExamResponse:
+    return await run_in_threadpool(create_exam, payload, db)
 
 
-@router.get("/exams", response_model=List[ExamResponse])
-def list_exams_endpoint(active_only: bool = False, db: Database = Depends(get_db)) -> List[ExamResponse]:
-    return list_exams(db, active_only=active_only)
+@router.get("/exams", response_model=None, responses=documented(List[ExamResponse]))
+async def list_exams_endpoint(active_only: bool = False, db: Database = Depends(provide_db)) -> Response:
+    return model_response(await run_in_threadpool(list_exams, db, active_only=active_only))
 
 
-@router.get("/exams/{exam_id}", response_model=ExamResponse)
-def get_exam_endpoint(exam_id: str, db: Database = Depends(get_db)) -> ExamResponse:
-    return get_exam(exam_id, db)
+@router.get("/exams/{exam_id}", response_model=None, responses=documented(ExamResponse))
+async def get_exam_endpoint(exam_id: str, request: Request, db: Database = Depends(provide_db)) -> Response:
+    return await cached_response(request, lambda: run_in_threadpool(get_exam, exam_id, db))
 
 
 @router.put("/exams/{exam_id}", response_model=ExamResponse)
-def update_exam_endpoint(
-    exam_id: str, payload: ExamUpdate, db: Database = Depends(get_db)
+async def update_exam_endpoint(
+    exam_id: str, payload: ExamUpdate, db: Database = Depends(provide_db)
 ) -> ExamResponse:
-    return update_exam(exam_id, payload, db)
+    return await run_in_threadpool(update_exam, exam_id, payload, db)
 
 
 @router.delete("/exams/{exam_id}")
-def delete_exam_endpoint(exam_id: str, db: Database = Depends(get_db)) -> dict:
-    delete_exam(exam_id, db)
+async def delete_exam_endpoint(exam_id: str, db: Database = Depends(provide_db)) -> dict:
+    await run_in_threadpool(delete_exam, exam_id, db)
     return {"status": "deleted", "exam_id": exam_id}
 
 
-@router.get("/exams/{exam_id}/syllabus", response_model=List[ExamSyllabusItem])
-def get_exam_syllabus_endpoint(exam_id: str, db: Database = Depends(get_db)) -> List[ExamSyllabusItem]:
-    return get_exam_syllabus(exam_id, db)
+@router.get("/exams/{exam_id}/syllabus", response_model=None, responses=documented(List[ExamSyllabusItem]))
+async def get_exam_syllabus_endpoint(exam_id: str, request: Request, db: Database = Depends(provide_db)) -> Response:
+    return await cached_response(request, lambda: run_in_threadpool(get_exam_syllabus, exam_id, db))
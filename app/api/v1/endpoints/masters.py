@@ -1,9 +1,12 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from fastapi import Query
+from fastapi.concurrency import run_in_threadpool
 
-from app.db.session import Database, get_db
+from app.api.v1.caching import cached_response
+from app.api.v1.responses import documented, model_response
+from app.db.session import Database, provide_db
 from app.schemas.master import (
     PaginatedSubjects,
     SubjectCreate,
@@ -32,22 +35,24 @@ router = APIRouter()
 
 
 @router.post("/subjects", response_model=SubjectResponse)
-def create_subject_endpoint(subject: SubjectCreate, db: Database = Depends(get_db)) -> SubjectResponse:
-    return create_subject(subject, db)
+async def create_subject_endpoint(subject: SubjectCreate, db: Database = Depends(provide_db)) -> SubjectResponse:
+    return await run_in_threadpool(create_subject, subject, db)
 
 
-@router.get("/subjects", response_model=PaginatedSubjects)
-def list_subjects_endpoint(
+@router.get("/subjects", response_model=None, responses=documented(PaginatedSubjects))
+async def list_subjects_endpoint(
     is_active: Optional[bool] = None,
     search: Optional[str] = None,
     tags: Optional[List[str]] = Query(default=None),
-    skip: int = 0,
+    skip: int = Query(default=0, deprecated=True, description="Offset paging; use cursor instead."),
     limit: int = 50,
     sort_by: str = "name",
     sort_order: str = "asc",
-    db: Database = Depends(get_db),
-) -> PaginatedSubjects:
-    return list_subjects(
+    cursor: Optional[str] = None,
+    db: Database = Depends(provide_db),
+) -> Response:
+    page = await run_in_threadpool(
+        list_subjects,
         db=db,
         is_active=is_active,
         search=search,
@@ -56,54 +61,57 @@ def list_subjects_endpoint(
         limit=limit,
         sort_by=sort_by,
         sort_order=sort_order,
+        cursor=cursor,
     )
+    return model_response(page)
 
 
-@router.get("/subjects/{subject_id}", response_model=SubjectResponse)
-def get_subject_endpoint(subject_id: str, db: Database = Depends(get_db)) -> SubjectResponse:
-    return get_subject(subject_id, db)
+@router.get("/subjects/{subject_id}", response_model=None, responses=documented(SubjectResponse))
+async def get_subject_endpoint(subject_id: str, request: Request, db: Database = Depends(provide_db)) -> Response:
+    return await cached_response(request, lambda: run_in_threadpool(get_subject, subject_id, db))
 
 
 @router.put("/subjects/{subject_id}", response_model=SubjectResponse)
-def update_subject_endpoint(
-    subject_id: str, payload: SubjectUpdate, db: Database = Depends(get_db)
+async def update_subject_endpoint(
+    subject_id: str, payload: SubjectUpdate, db: Database = Depends(provide_db)
 ) -> SubjectResponse:
-    return update_subject(subject_id, payload, db)
+    return await run_in_threadpool(update_subject, subject_id, payload, db)
 
 
 @router.delete("/subjects/{subject_id}")
-def delete_subject_endpoint(subject_id: str, db: Database = Depends(get_db)) -> dict:
-    delete_subject(subject_id, db)
+async def delete_subject_endpoint(subject_id: str, db: Database = Depends(provide_db)) -> dict:
+    await run_in_threadpool(delete_subject, subject_id, db)
     return {"status": "deleted", "subject_id": subject_id}
 
 
 @router.post("/topics", response_model=TopicResponse)
-def create_topic_endpoint(topic: TopicCreate, db: Database = Depends(get_db)) -> TopicResponse:
-    return create_topic(topic, db)
+async def create_topic_endpoint(topic: TopicCreate, db: Database = Depends(provide_db)) -> TopicResponse:
+    return await run_in_threadpool(create_topic, topic, db)
 
 
-@router.get("/topics", response_model=List[TopicResponse])
-def list_topics_endpoint(subject_id: Optional[str] = None, db: Database = Depends(get_db)) -> List[TopicResponse]:
-    return list_topics(subject_id, db)
+@router.get("/topics", response_model=None, responses=documented(List[TopicResponse]))
+async def list_topics_endpoint(subject_id: Optional[str] = None, db: Database = Depends(provide_db)) -> Response:
+    return model_response(await run_in_threadpool(list_topics, subject_id, db))
 
 
-@router.get("/topics/{topic_id}", response_model=TopicResponse)
-def get_topic_endpoint(topic_id: str, db: Database = Depends(get_db)) -> TopicResponse:
-    return get_topic(topic_id, db)
+@router.get("/topics/{topic_id}", response_model=None, responses=documented(TopicResponse))
+async def get_topic_endpoint(topic_id: str, db: Database = Depends(provide_db)) -> Response:
+    return model_response(await run_in_threadpool(get_topic, topic_id, db))
 
 
 @router.put("/topics/{topic_id}", response_model=TopicResponse)
-def update_topic_endpoint(
-    topic_id: str, payload: TopicUpdate, db: Database = Depends(get_db)
+async def update_topic_endpoint(
+    topic_id: str, payload: TopicUpdate, db: Database = Depends(provide_db)
 ) -> TopicResponse:
-    return update_topic(topic_id, payload, db)
+    return await run_in_threadpool(update_topic, topic_id, payload, db)
 
 
 @router.patch("/topics/{topic_id}/links", response_model=TopicResponse)
-def update_topic_links_endpoint(
-    topic_id: str, payload: TopicUpdateLinks, db: Database = Depends(get_db)
+async def update_topic_links_endpoint(
+    topic_id: str, payload: TopicUpdateLinks, db: Database = Depends(provide_db)
 ) -> TopicResponse:
-    return update_topic_links(
+    return await run_in_threadpool(
+        update_topic_links,
         topic_id,
         related_topic_ids=payload.related_topic_ids,
         prerequisite_topic_ids=payload.prerequisite_topic_ids,
@@ -112,6 +120,6 @@ def update_topic_links_endpoint(
 
 
 @router.delete("/topics/{topic_id}")
-def delete_topic_endpoint(topic_id: str, db: Database = Depends(get_db)) -> dict:
-    delete_topic(topic_id, db)
+async def delete_topic_endpoint(topic_id: str, db: Database = Depends(provide_db)) -> dict:
+    await run_in_threadpool(delete_topic, topic_id, db)
     return {"status": "deleted", "topic_id": topic_id}
@@ -1,7 +1,9 @@
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.concurrency import run_in_threadpool
 
+from app.api.v1.responses import documented, model_response
 from app.schemas.question_doc import (
     PaginatedQuestions,
     QuestionDocCreate,
@@ -16,102 +18,82 @@ router = APIRouter()
 
 
 @router.post("/questions", response_model=QuestionFullView, status_code=201)
-def create_question_endpoint(payload: QuestionDocCreate) -> QuestionFullView:
-    return create_question(payload)
+async def create_question_endpoint(payload: QuestionDocCreate) -> QuestionFullView:
+    return await run_in_threadpool(create_question, payload)
 
 
 @router.patch("/questions/{question_id}", response_model=QuestionFullView)
-def update_question_endpoint(question_id: str, payload: QuestionDocUpdate) -> QuestionFullView:
-    return update_question(question_id, payload)
+async def update_question_endpoint(question_id: str, payload: QuestionDocUpdate) -> QuestionFullView:
+    return await run_in_threadpool(update_question, question_id, payload)
 
 
-@router.get(
-    "/questions/{question_id}",
-    response_model=QuestionFullView | QuestionPreviewView | QuestionPublicView,
-    response_model_exclude_none=True,
-)
-def get_question_endpoint(
-    question_id: str,
-    include_solution: bool = False,
-    include_answer_key: bool = False,
-) -> QuestionPublicView | QuestionPreviewView | QuestionFullView:
-    return get_question(question_id, include_solution=include_solution, include_answer_key=include_answer_key)
-
-
-@router.get("/list/questions/discover", response_model=PaginatedQuestions, response_model_exclude_none=True)
-def discover_questions_endpoint(
-    subject_id: Optional[str] = None,
-    topic_ids: Optional[List[str]] = Query(default=None),
-    target_exam_ids: Optional[List[str]] = Query(default=None),
-    difficulty_min: Optional[int] = None,
-    difficulty_max: Optional[int] = None,
-    tags: Optional[List[str]] = Query(default=None),
-    status_value: Optional[str] = "published",
-    is_active: Optional[bool] = True,
-    search: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 20,
-    sort_by: str = "created_at",
-    sort_order: str = "desc",
-) -> PaginatedQuestions:
-    return discover_questions(
-        subject_id=subject_id,
-        topic_ids=topic_ids,
-        target_exam_ids=target_exam_ids,
-        difficulty_min=difficulty_min,
-        difficulty_max=difficulty_max,
-        tags=tags,
-        status_value=status_value,
-        is_active=is_active,
-        search=search,
-        skip=skip,
-        limit=limit,
-        sort_by=sort_by,
-        sort_order=sort_order,
-    )
+def question_filter(default_status: Optional[str], default_active: Optional[bool]) -> Callable[..., Dict[str, Any]]:
+    """
+    Dependency declaring the discovery/list query parameters, returned as ``discover_questions`` kwargs.
 
+    The two routes differ only in the default status/active filter.
+    """
 
-@router.get("/questions/list", response_model=PaginatedQuestions, response_model_exclude_none=True)
-def list_questions_endpoint(
-    subject_id: Optional[str] = None,
-    topic_ids: Optional[List[str]] = Query(default=None),
-    target_exam_ids: Optional[List[str]] = Query(default=None),
-    difficulty_min: Optional[int] = None,
-    difficulty_max: Optional[int] = None,
-    tags: Optional[List[str]] = Query(default=None),
-    status_value: Optional[str] = None,
-    is_active: Optional[bool] = None,
-    search: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 20,
-    sort_by: str = "created_at",
-    sort_order: str = "desc",
-) -> PaginatedQuestions:
+    def params(
+        subject_id: Optional[str] = None,
+        topic_ids: Optional[List[str]] = Query(default=None),
+        target_exam_ids: Optional[List[str]] = Query(default=None),
+        difficulty_min: Optional[int] = None,
+        difficulty_max: Optional[int] = None,
+        tags: Optional[List[str]] = Query(default=None),
+        status_value: Optional[str] = default_status,
+        is_active: Optional[bool] = default_active,
+        search: Optional[str] = None,
+        skip: int = Query(default=0, deprecated=True, description="Offset paging; use cursor instead."),
+        limit: int = 20,
+        sort_by: str = "created_at",
+        sort_order: str = "desc",
+        cursor: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return {
+            "subject_id": subject_id,
+            "topic_ids": topic_ids,
+            "target_exam_ids": target_exam_ids,
+            "difficulty_min": difficulty_min,
+            "difficulty_max": difficulty_max,
+            "tags": tags,
+            "status_value": status_value,
+            "is_active": is_active,
+            "search": search,
+            "skip": skip,
+            "limit": limit,
+            "sort_by": sort_by,
+            "sort_order": sort_order,
+            "cursor": cursor,
+        }
+
+    return params
+
+
+@router.get("/list/questions/discover", response_model=None, responses=documented(PaginatedQuestions))
+async def discover_questions_endpoint(
+    filters: Dict[str, Any] = Depends(question_filter(default_status="published", default_active=True))
+) -> Response:
+    page = await run_in_threadpool(discover_questions, **filters)
+    return model_response(page, exclude_none=True)
+
+
+@router.get("/questions/list", response_model=None, responses=documented(PaginatedQuestions))
+async def list_questions_endpoint(
+    filters: Dict[str, Any] = Depends(question_filter(default_status=None, default_active=None))
+) -> Response:
     """
     List questions with full filtering and pagination.
 
     If no filters are provided, returns all schema_version=2 questions with the chosen sort and pagination.
     """
 
-    return discover_questions(
-        subject_id=subject_id,
-        topic_ids=topic_ids,
-        target_exam_ids=target_exam_ids,
-        difficulty_min=difficulty_min,
-        difficulty_max=difficulty_max,
-        tags=tags,
-        status_value=status_value,
-        is_active=is_active,
-        search=search,
-        skip=skip,
-        limit=limit,
-        sort_by=sort_by,
-        sort_order=sort_order,
-    )
+    page = await run_in_threadpool(discover_questions, **filters)
+    return model_response(page, exclude_none=True)
 
 
-@router.get("/questions/sample", response_model=List[QuestionPublicView], response_model_exclude_none=True)
-def sample_questions_endpoint(
+@router.get("/questions/sample", response_model=None, responses=documented(List[QuestionPublicView]))
+async def sample_questions_endpoint(
     subject_id: Optional[str] = None,
     topic_ids: Optional[List[str]] = Query(default=None),
     target_exam_ids: Optional[List[str]] = Query(default=None),
@@ -122,8 +104,9 @@ def sample_questions_endpoint(
     is_active: Optional[bool] = True,
     limit: int = 1,
     seed: Optional[str] = None,
-) -> List[QuestionPublicView]:
-    return sample_questions(
+) -> Response:
+    items = await run_in_threadpool(
+        sample_questions,
         subject_id=subject_id,
         topic_ids=topic_ids,
         target_exam_ids=target_exam_ids,
@@ -135,3 +118,20 @@ def sample_questions_endpoint(
         limit=limit,
         seed=seed,
     )
+    return model_response(items, exclude_none=True)
+
+
+@router.get(
+    "/questions/{question_id}",
+    response_model=None,
+    responses=documented(QuestionFullView | QuestionPreviewView | QuestionPublicView),
+)
+async def get_question_endpoint(
+    question_id: str,
+    include_solution: bool = False,
+    include_answer_key: bool = False,
+) -> Response:
+    question = await run_in_threadpool(
+        get_question, question_id, include_solution=include_solution, include_answer_key=include_answer_key
+    )
+    return model_response(question, exclude_none=True)
@@ -1,12 +1,13 @@
+import hashlib
 import logging
 import os
-import hmac
+import secrets
 
 from fastapi import APIRouter, Depends, Header, HTTPException, status
 
-from app.security.api_keys import generate_api_key, hash_api_key, register_api_key, is_raw_key_valid
+from app.security.api_keys import generate_api_key, register_api_key, is_raw_key_valid
 from app.security.rate_limit import RateLimiter
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +16,25 @@ router = APIRouter()
 default_limiter = RateLimiter(limit=60, window_seconds=60)
 burst_limiter = RateLimiter(limit=10, window_seconds=60)
 
+# (settings instance, SHA-256 of ADMIN_MASTER_KEY); rebuilt only when the cached settings are replaced.
+_admin_key_cache: tuple[Settings | None, bytes | None] = (None, None)
+
+
+def _key_digest(key: str) -> bytes:
+    return hashlib.sha256(key.encode("utf-8")).digest()
+
+
+def _admin_key_digest() -> bytes | None:
+    """Return the ADMIN_MASTER_KEY digest, hashing it once per settings instance."""
+
+    global _admin_key_cache
+    settings = get_settings()
+    cached_settings, digest = _admin_key_cache
+    if cached_settings is not settings:
+        digest = _key_digest(settings.admin_master_key) if settings.admin_master_key else None
+        _admin_key_cache = (settings, digest)
+    return digest
+
 
 def admin_guard(
     x_admin_key: str | None = Header(default=None),
@@ -22,16 +42,17 @@ def admin_guard(
 ) -> None:
     """
     Allow access if:
-    - X-Admin-Key matches ADMIN_MASTER_KEY (constant-time compare), OR
-    - X-API-Key is a registered API key.
+    - X-API-Key is a registered API key (checked first; the common case), OR
+    - X-Admin-Key matches ADMIN_MASTER_KEY (constant-time compare of fixed-length SHA-256
+      digests, so timing reveals nothing about the key's length either).
     """
 
-    settings = get_settings()
-    if settings.admin_master_key and x_admin_key:
-        if hmac.compare_digest(x_admin_key, settings.admin_master_key):
-            return
     if x_api_key and is_raw_key_valid(x_api_key):
         return
+    if x_admin_key:
+        admin_digest = _admin_key_digest()
+        if admin_digest and secrets.compare_digest(_key_digest(x_admin_key), admin_digest):
+            return
     raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or missing admin/API key")
 
 
@@ -1,8 +1,11 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 
-from app.db.session import Database, get_db
+from app.api.v1.caching import cached_response
+from app.api.v1.responses import documented, model_response
+from app.db.session import Database, provide_db
 from app.schemas.test_series import TestSeriesCreate, TestSeriesResponse, TestSeriesUpdate, PaginatedTestSeries
 from app.services.test_series_service import (
     create_test_series,
@@ -20,12 +23,12 @@ router = APIRouter()
 
 
 @router.post("/test-series", response_model=TestSeriesResponse)
-def create_test_series_endpoint(payload: TestSeriesCreate, db: Database = Depends(get_db)) -> TestSeriesResponse:
-    return create_test_series(payload, db)
+async def create_test_series_endpoint(payload: TestSeriesCreate, db: Database = Depends(provide_db)) -> TestSeriesResponse:
+    return await run_in_threadpool(create_test_series, payload, db)
 
 
-@router.get("/test-series", response_model=PaginatedTestSeries)
-def list_test_series_endpoint(
+@router.get("/test-series", response_model=None, responses=documented(PaginatedTestSeries))
+async def list_test_series_endpoint(
     exam_id: Optional[str] = None,
     target_exam_id: Optional[str] = None,
     series_type: Optional[str] = None,
@@ -35,13 +38,15 @@ def list_test_series_endpoint(
     difficulty: Optional[int] = None,
     language: Optional[str] = None,
     language_code: Optional[str] = None,
-    skip: int = 0,
+    skip: int = Query(default=0, deprecated=True, description="Offset paging; use cursor instead."),
     limit: int = 50,
     sort_by: str = "display_order",
     sort_order: str = "asc",
-    db: Database = Depends(get_db),
-) -> PaginatedTestSeries:
-    return list_test_series(
+    cursor: Optional[str] = None,
+    db: Database = Depends(provide_db),
+) -> Response:
+    page = await run_in_threadpool(
+        list_test_series,
         db=db,
         exam_id=exam_id,
         target_exam_id=target_exam_id,
@@ -56,47 +61,51 @@ def list_test_series_endpoint(
         limit=limit,
         sort_by=sort_by,
         sort_order=sort_order,
+        cursor=cursor,
     )
+    return model_response(page)
 
 
-@router.get("/test-series/{series_id}", response_model=TestSeriesResponse)
-def get_test_series_endpoint(series_id: str, db: Database = Depends(get_db)) -> TestSeriesResponse:
-    return get_test_series(series_id, db)
+@router.get("/test-series/{series_id}", response_model=None, responses=documented(TestSeriesResponse))
+async def get_test_series_endpoint(series_id: str, request: Request, db: Database = Depends(provide_db)) -> Response:
+    return await cached_response(request, lambda: run_in_threadpool(get_test_series, series_id, db))
 
 
 @router.put("/test-series/{series_id}", response_model=TestSeriesResponse)
-def update_test_series_endpoint(series_id: str, payload: TestSeriesUpdate, db: Database = Depends(get_db)) -> TestSeriesResponse:
-    return update_test_series(series_id, payload, db)
+async def update_test_series_endpoint(series_id: str, payload: TestSeriesUpdate, db: Database = Depends(provide_db)) -> TestSeriesResponse:
+    return await run_in_threadpool(update_test_series, series_id, payload, db)
 
 
 @router.patch("/test-series/{series_id}/status", response_model=TestSeriesResponse)
-def update_test_series_status_endpoint(series_id: str, status_value: str, db: Database = Depends(get_db)) -> TestSeriesResponse:
-    return update_test_series_status(series_id, status_value, db)
+async def update_test_series_status_endpoint(series_id: str, status_value: str, db: Database = Depends(provide_db)) -> TestSeriesResponse:
+    return await run_in_threadpool(update_test_series_status, series_id, status_value, db)
 
 
 @router.delete("/test-series/{series_id}", status_code=204)
-def delete_test_series_endpoint(series_id: str, db: Database = Depends(get_db)) -> None:
-    delete_test_series(series_id, db)
+async def delete_test_series_endpoint(series_id: str, db: Database = Depends(provide_db)) -> None:
+    await run_in_threadpool(delete_test_series, series_id, db)
 
 
-@router.get("/test-series/{series_id}/stats")
-def test_series_stats_endpoint(series_id: str, db: Database = Depends(get_db)) -> dict:
-    return get_series_stats(series_id, db)
+@router.get("/test-series/{series_id}/stats", response_model=None)
+async def test_series_stats_endpoint(series_id: str, db: Database = Depends(provide_db)) -> Response:
+    return model_response(await run_in_threadpool(get_series_stats, series_id, db))
 
 
-@router.get("/test-series/{series_id}/tests", response_model=PaginatedTests)
-def list_tests_for_series_endpoint(
+@router.get("/test-series/{series_id}/tests", response_model=None, responses=documented(PaginatedTests))
+async def list_tests_for_series_endpoint(
     series_id: str,
     status: Optional[str] = None,
     is_active: Optional[bool] = None,
-    skip: int = 0,
+    skip: int = Query(default=0, deprecated=True, description="Offset paging; use cursor instead."),
     limit: int = 50,
     sort_by: str = "test_number",
     sort_order: str = "asc",
-    db: Database = Depends(get_db),
-) -> PaginatedTests:
+    cursor: Optional[str] = None,
+    db: Database = Depends(provide_db),
+) -> Response:
     # Exclude heavy questions payload for listing
-    return list_tests(
+    page = await run_in_threadpool(
+        list_tests,
         db=db,
         series_id=series_id,
         status=status,
@@ -106,4 +115,6 @@ def list_tests_for_series_endpoint(
         include_questions=False,
         sort_by=sort_by,
         sort_order=sort_order,
+        cursor=cursor,
     )
+    return model_response(page)
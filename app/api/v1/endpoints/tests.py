@@ -1,8 +1,11 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 
-from app.db.session import Database, get_db
+from app.api.v1.caching import cached_response
+from app.api.v1.responses import documented, model_response
+from app.db.session import Database, provide_db
 from app.schemas.test import (
     AddQuestionsRequest,
     BulkAddRequest,
@@ -42,38 +45,40 @@ router = APIRouter()
 
 
 @router.post("/tests", response_model=TestResponse)
-def create_test_endpoint(payload: TestCreate, db: Database = Depends(get_db)) -> TestResponse:
-    return create_test(payload, db)
+async def create_test_endpoint(payload: TestCreate, db: Database = Depends(provide_db)) -> TestResponse:
+    return await run_in_threadpool(create_test, payload, db)
 
 
-@router.get("/tests/{test_id}", response_model=TestResponse)
-def get_test_endpoint(test_id: str, db: Database = Depends(get_db)) -> TestResponse:
-    return get_test(test_id, db)
+@router.get("/tests/{test_id}", response_model=None, responses=documented(TestResponse))
+async def get_test_endpoint(test_id: str, request: Request, db: Database = Depends(provide_db)) -> Response:
+    return await cached_response(request, lambda: run_in_threadpool(get_test, test_id, db))
 
 
 @router.put("/tests/{test_id}", response_model=TestResponse)
-def update_test_endpoint(test_id: str, payload: TestUpdate, db: Database = Depends(get_db)) -> TestResponse:
-    return update_test(test_id, payload, db)
+async def update_test_endpoint(test_id: str, payload: TestUpdate, db: Database = Depends(provide_db)) -> TestResponse:
+    return await run_in_threadpool(update_test, test_id, payload, db)
 
 
 @router.delete("/tests/{test_id}")
-def delete_test_endpoint(test_id: str, db: Database = Depends(get_db)) -> dict:
-    delete_test(test_id, db)
+async def delete_test_endpoint(test_id: str, db: Database = Depends(provide_db)) -> dict:
+    await run_in_threadpool(delete_test, test_id, db)
     return {"status": "deleted", "test_id": test_id}
 
 
-@router.get("/tests", response_model=PaginatedTests)
-def list_tests_endpoint(
+@router.get("/tests", response_model=None, responses=documented(PaginatedTests))
+async def list_tests_endpoint(
     series_id: Optional[str] = None,
     status: Optional[str] = None,
     is_active: Optional[bool] = None,
-    skip: int = 0,
+    skip: int = Query(default=0, deprecated=True, description="Offset paging; use cursor instead."),
     limit: int = 50,
     sort_by: str = "test_number",
     sort_order: str = "asc",
-    db: Database = Depends(get_db),
-) -> PaginatedTests:
-    return list_tests(
+    cursor: Optional[str] = None,
+    db: Database = Depends(provide_db),
+) -> Response:
+    page = await run_in_threadpool(
+        list_tests,
         db=db,
         series_id=series_id,
         status=status,
@@ -82,79 +87,81 @@ def list_tests_endpoint(
         limit=limit,
         sort_by=sort_by,
         sort_order=sort_order,
+        cursor=cursor,
     )
+    return model_response(page)
 
 
 @router.post("/tests/{test_id}/questions", response_model=List[QuestionReference])
-def add_questions_endpoint(test_id: str, payload: AddQuestionsRequest, db: Database = Depends(get_db)) -> List[QuestionReference]:
-    return add_questions_to_test(test_id, payload, db)
+async def add_questions_endpoint(test_id: str, payload: AddQuestionsRequest, db: Database = Depends(provide_db)) -> List[QuestionReference]:
+    return await run_in_threadpool(add_questions_to_test, test_id, payload, db)
 
 
 @router.post("/tests/{test_id}/questions/bulk-add", response_model=List[QuestionReference])
-def bulk_add_questions_endpoint(test_id: str, payload: BulkAddRequest, db: Database = Depends(get_db)) -> List[QuestionReference]:
-    return bulk_add_questions(test_id, payload, db)
+async def bulk_add_questions_endpoint(test_id: str, payload: BulkAddRequest, db: Database = Depends(provide_db)) -> List[QuestionReference]:
+    return await run_in_threadpool(bulk_add_questions, test_id, payload, db)
 
 
 @router.delete("/tests/{test_id}/questions/{question_id}")
-def remove_question_endpoint(test_id: str, question_id: str, db: Database = Depends(get_db)) -> dict:
-    remove_question(test_id, question_id, db)
+async def remove_question_endpoint(test_id: str, question_id: str, db: Database = Depends(provide_db)) -> dict:
+    await run_in_threadpool(remove_question, test_id, question_id, db)
     return {"status": "deleted", "question_id": question_id}
 
 
 @router.patch("/tests/{test_id}/questions/reorder", response_model=List[QuestionReference])
-def reorder_questions_endpoint(test_id: str, payload: ReorderRequest, db: Database = Depends(get_db)) -> List[QuestionReference]:
-    return reorder_questions(test_id, payload, db)
+async def reorder_questions_endpoint(test_id: str, payload: ReorderRequest, db: Database = Depends(provide_db)) -> List[QuestionReference]:
+    return await run_in_threadpool(reorder_questions, test_id, payload, db)
 
 
 @router.put("/tests/{test_id}/questions/{old_question_id}/replace", response_model=QuestionReference)
-def replace_question_endpoint(
+async def replace_question_endpoint(
     test_id: str,
     old_question_id: str,
     payload: ReplaceQuestionRequest,
-    db: Database = Depends(get_db),
+    db: Database = Depends(provide_db),
 ) -> QuestionReference:
-    return replace_question(test_id, old_question_id, payload, db)
+    return await run_in_threadpool(replace_question, test_id, old_question_id, payload, db)
 
 
 @router.patch("/tests/{test_id}/questions/{question_id}/marks", response_model=QuestionReference)
-def update_question_marks_endpoint(
-    test_id: str, question_id: str, payload: UpdateMarksRequest, db: Database = Depends(get_db)
+async def update_question_marks_endpoint(
+    test_id: str, question_id: str, payload: UpdateMarksRequest, db: Database = Depends(provide_db)
 ) -> QuestionReference:
-    return update_question_marks(test_id, question_id, payload, db)
+    return await run_in_threadpool(update_question_marks, test_id, question_id, payload, db)
 
 
-@router.get("/tests/{test_id}/preview")
-def test_preview_endpoint(test_id: str, db: Database = Depends(get_db)) -> dict:
-    return get_test_preview(test_id, db)
+@router.get("/tests/{test_id}/preview", response_model=None)
+async def test_preview_endpoint(test_id: str, request: Request, db: Database = Depends(provide_db)) -> Response:
+    return await cached_response(request, lambda: run_in_threadpool(get_test_preview, test_id, db))
 
 
-@router.get("/tests/{test_id}/with-solutions")
-def test_with_solutions_endpoint(test_id: str, db: Database = Depends(get_db)) -> dict:
-    return get_test_with_solutions(test_id, db)
+@router.get("/tests/{test_id}/with-solutions", response_model=None)
+async def test_with_solutions_endpoint(test_id: str, db: Database = Depends(provide_db)) -> Response:
+    return model_response(await run_in_threadpool(get_test_with_solutions, test_id, db))
 
 
-@router.get("/tests/{test_id}/answer-key")
-def answer_key_endpoint(test_id: str, db: Database = Depends(get_db)) -> dict:
-    return get_answer_key(test_id, db)
+@router.get("/tests/{test_id}/answer-key", response_model=None)
+async def answer_key_endpoint(test_id: str, request: Request, db: Database = Depends(provide_db)) -> Response:
+    return await cached_response(request, lambda: run_in_threadpool(get_answer_key, test_id, db))
 
 
-@router.get("/tests/{test_id}/validate", response_model=ValidationResult)
-def validate_test_endpoint(test_id: str, db: Database = Depends(get_db)) -> ValidationResult:
-    return validate_test(test_id, db)
+@router.get("/tests/{test_id}/validate", response_model=None, responses=documented(ValidationResult))
+async def validate_test_endpoint(test_id: str, db: Database = Depends(provide_db)) -> Response:
+    return model_response(await run_in_threadpool(validate_test, test_id, db))
 
 
-@router.get("/tests/{test_id}/stats", response_model=TestStats)
-def test_stats_endpoint(test_id: str, db: Database = Depends(get_db)) -> TestStats:
-    return test_stats(test_id, db)
+@router.get("/tests/{test_id}/stats", response_model=None, responses=documented(TestStats))
+async def test_stats_endpoint(test_id: str, db: Database = Depends(provide_db)) -> Response:
+    return model_response(await run_in_threadpool(test_stats, test_id, db))
 
 
-@router.get("/tests/{test_id}/instructions", response_model=TestInstructionsResponse)
-def get_test_instructions_endpoint(test_id: str, db: Database = Depends(get_db)) -> TestInstructionsResponse:
-    return get_test_instructions(test_id, db)
+@router.get("/tests/{test_id}/instructions", response_model=None, responses=documented(TestInstructionsResponse))
+async def get_test_instructions_endpoint(test_id: str, db: Database = Depends(provide_db)) -> Response:
+    return model_response(await run_in_threadpool(get_test_instructions, test_id, db))
 
 
 @router.put("/tests/{test_id}/instructions", response_model=TestInstructionsResponse)
-def upsert_test_instructions_endpoint(
-    test_id: str, payload: TestInstructionsCreate, db: Database = Depends(get_db)
+async def upsert_test_instructions_endpoint(
+    test_id: str, payload: TestInstructionsCreate, db: Database = Depends(provide_db)
 ) -> TestInstructionsResponse:
-    return upsert_test_instructions(test_id, payload, db)
+    return await run_in_threadpool(upsert_test_instructions, test_id, payload, db)
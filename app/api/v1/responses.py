@@ -0,0 +1,24 @@
+from typing import Any, Dict
+
+from fastapi import Response
+from pydantic_core import to_json
+
+
+def documented(model: Any) -> Dict[int | str, Dict[str, Any]]:
+    """OpenAPI `responses` entry documenting a route that returns a pre-serialized model."""
+
+    return {200: {"model": model}}
+
+
+def model_response(content: Any, *, exclude_none: bool = False, status_code: int = 200) -> Response:
+    """
+    Serialize service-built models (or a list of them) straight into a JSON response.
+
+    Services already return validated models, so routes using this declare
+    response_model=None and skip FastAPI's second validation pass over every item.
+    pydantic-core writes the JSON bytes in one pass, without building the intermediate
+    dict that model_dump() + a JSON encoder would need.
+    """
+
+    body = to_json(content, by_alias=True, exclude_none=exclude_none)
+    return Response(content=body, media_type="application/json", status_code=status_code)
@@ -1,5 +1,8 @@
+import re
 from functools import lru_cache
+from typing import FrozenSet, Optional
 
+import orjson
 from pydantic import AliasChoices, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -17,8 +20,78 @@ class Settings(BaseSettings):
         default="mqdb",
         validation_alias=AliasChoices("MQDB_MONGO_DB_NAME", "MQDB_DB_NAME", "MONGO_DB_NAME"),
     )
-    cors_origins: list[str] = Field(
-        default=["*"],
+    mongo_max_pool_size: int = Field(
+        default=100,
+        ge=1,
+        description="Upper bound on pooled Mongo connections per process (keep >= threadpool_size)",
+        validation_alias=AliasChoices("MQDB_MONGO_MAX_POOL_SIZE", "MONGO_MAX_POOL_SIZE"),
+    )
+    mongo_min_pool_size: int = Field(
+        default=10,
+        ge=0,
+        description="Connections kept warm so bursts do not pay connection setup",
+        validation_alias=AliasChoices("MQDB_MONGO_MIN_POOL_SIZE", "MONGO_MIN_POOL_SIZE"),
+    )
+    mongo_max_pool_total: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Connection budget shared by all worker processes; overrides mongo_max_pool_size with total // web_workers",
+        validation_alias=AliasChoices("MQDB_MONGO_MAX_POOL_TOTAL", "MONGO_MAX_POOL_TOTAL"),
+    )
+    web_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Number of server worker processes, used to split mongo_max_pool_total",
+        validation_alias=AliasChoices("MQDB_WEB_WORKERS", "WEB_CONCURRENCY"),
+    )
+    mongo_wait_queue_timeout_ms: int = Field(
+        default=2000,
+        ge=0,
+        description="Fail a request that waits this long for a free pooled connection (0 waits forever)",
+        validation_alias=AliasChoices("MQDB_MONGO_WAIT_QUEUE_TIMEOUT_MS", "MONGO_WAIT_QUEUE_TIMEOUT_MS"),
+    )
+    mongo_max_idle_time_ms: int = Field(
+        default=300000,
+        ge=0,
+        description="Recycle pooled connections idle longer than this (0 disables)",
+        validation_alias=AliasChoices("MQDB_MONGO_MAX_IDLE_TIME_MS", "MONGO_MAX_IDLE_TIME_MS"),
+    )
+    mongo_server_selection_timeout_ms: int = Field(
+        default=2000,
+        ge=1,
+        description="Fail fast when no suitable Mongo server is reachable",
+        validation_alias=AliasChoices("MQDB_MONGO_SERVER_SELECTION_TIMEOUT_MS", "MONGO_SERVER_SELECTION_TIMEOUT_MS"),
+    )
+    mongo_socket_timeout_ms: int = Field(
+        default=10000,
+        ge=0,
+        description="Abort a Mongo operation whose socket stays silent this long (0 disables)",
+        validation_alias=AliasChoices("MQDB_MONGO_SOCKET_TIMEOUT_MS", "MONGO_SOCKET_TIMEOUT_MS"),
+    )
+    mongo_write_concern: str = Field(
+        default="1",
+        description="Write concern 'w' for Mongo writes: a node count such as '1', or 'majority'",
+        validation_alias=AliasChoices("MQDB_MONGO_WRITE_CONCERN", "MONGO_WRITE_CONCERN"),
+    )
+    trust_db_schema: bool = Field(
+        default=True,
+        description="Hydrate models read from Mongo without re-validating them",
+        validation_alias=AliasChoices("MQDB_TRUST_DB_SCHEMA", "TRUST_DB_SCHEMA"),
+    )
+    seed_demo_data: bool = Field(
+        default=True,
+        description="Insert the sample Physics masters, exam and questions at startup when the database is empty",
+        validation_alias=AliasChoices("MQDB_SEED_DEMO", "SEED_DEMO"),
+    )
+    mongo_compressors: str = Field(
+        default="zstd,zlib",
+        description="Wire compressors offered to Mongo in preference order",
+        validation_alias=AliasChoices("MQDB_MONGO_COMPRESSORS", "MONGO_COMPRESSORS"),
+    )
+    # Typed as a union with str so pydantic-settings hands comma-separated env values to
+    # split_origins instead of failing to JSON-decode them.
+    cors_origins: tuple[str, ...] | str = Field(
+        default=("*",),
         description="Comma-separated origins allowed for CORS (use '*' for all)",
         validation_alias=AliasChoices("MQDB_CORS_ORIGINS", "CORS_ORIGINS"),
     )
@@ -27,8 +100,40 @@ class Settings(BaseSettings):
     admin_master_key: str | None = Field(
         default=None, validation_alias=AliasChoices("ADMIN_MASTER_KEY", "MQDB_ADMIN_MASTER_KEY")
     )
+    redis_url: str | None = Field(
+        default=None,
+        description="Redis connection URL for state shared across workers (e.g. rate limits)",
+        validation_alias=AliasChoices("MQDB_REDIS_URL", "REDIS_URL"),
+    )
+    response_cache_ttl_seconds: int = Field(
+        default=60,
+        ge=1,
+        description="Lifetime of cached read-mostly GET responses (exams, subjects, series, test previews)",
+        validation_alias=AliasChoices("MQDB_RESPONSE_CACHE_TTL", "RESPONSE_CACHE_TTL"),
+    )
+    # Invalidation is per process, so other workers can serve a changed or deleted master for up to this
+    # long on top of their own response cache TTL. Ignored (no master caching) when redis_url is set.
+    master_cache_ttl_seconds: int = Field(
+        default=30,
+        ge=0,
+        description="Lifetime of cached subject/topic/exam lookups per process without Redis (0 disables)",
+        validation_alias=AliasChoices("MQDB_MASTER_CACHE_TTL", "MASTER_CACHE_TTL"),
+    )
+    query_cache_ttl_seconds: int = Field(
+        default=30,
+        ge=0,
+        description="Lifetime of cached question query results per process (0 disables)",
+        validation_alias=AliasChoices("MQDB_QUERY_CACHE_TTL", "QUERY_CACHE_TTL"),
+    )
+    threadpool_size: int = Field(
+        default=100,
+        ge=1,
+        description="Worker threads available for blocking repository calls made by async endpoints",
+        validation_alias=AliasChoices("MQDB_THREADPOOL_SIZE", "THREADPOOL_SIZE"),
+    )
 
-    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="allow")
+    # Frozen because get_settings() hands the same instance to every caller for the life of the process.
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="allow", frozen=True)
 
     @field_validator("cors_origins", mode="before")
     @classmethod
@@ -36,17 +141,34 @@ class Settings(BaseSettings):
         """Allow comma-separated or JSON array strings for CORS origins."""
 
         if isinstance(value, str):
-            if value.strip() == "":
-                return []
-            # If provided as JSON array, let pydantic parse it
-            if value.strip().startswith("["):
-                return value
-            return [item.strip() for item in value.split(",") if item.strip()]
+            value = value.strip()
+            if value == "":
+                return ()
+            if value.startswith("["):
+                return tuple(orjson.loads(value))
+            return tuple(item.strip() for item in value.split(",") if item.strip())
         return value
 
+    @property
+    def cors_allow_origins(self) -> FrozenSet[str]:
+        """Exact origins (and a bare '*') as a set, so CORSMiddleware checks each request with one hash lookup."""
+
+        return frozenset(origin for origin in self.cors_origins if origin == "*" or "*" not in origin)
+
+    @property
+    def cors_origin_regex(self) -> Optional[str]:
+        """Single pattern for wildcard origins such as `https://*.example.com`; `*` matches one host label."""
+
+        patterns = [
+            re.escape(origin).replace(r"\*", "[A-Za-z0-9-]+")
+            for origin in self.cors_origins
+            if origin != "*" and "*" in origin
+        ]
+        return "|".join(patterns) or None
+
 
-@lru_cache()
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Return cached settings instance."""
+    """Return the process-wide settings, parsing the environment and .env only on the first call."""
 
     return Settings()
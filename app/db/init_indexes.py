@@ -0,0 +1,19 @@
+"""
+Create MongoDB indexes ahead of deployment: ``python -m app.db.init_indexes``.
+
+Unlike worker startup, this also rebuilds indexes whose options changed and migrates stored data
+(legacy float rand_key values), so run it once per deploy.
+"""
+
+from app.db.session import close_db, get_db
+
+
+def main() -> None:
+    try:
+        get_db().migrate()
+    finally:
+        close_db()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import base64
+from datetime import datetime
+from typing import Any, Dict, NamedTuple, Optional, Sequence
+
+import orjson
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import DESCENDING
+
+
+def resolve_sort_field(sort_by: str, allowed: Sequence[str]) -> str:
+    """Return sort_by if it is whitelisted, otherwise the first (default) allowed field."""
+
+    return sort_by if sort_by in allowed else allowed[0]
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    if isinstance(value, ObjectId):
+        # Legacy documents keep Mongo's generated ObjectId as their _id.
+        return {"$oid": str(value)}
+    return value
+
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _decode_value(value: Any) -> Any:
+    # Decoded values go straight into a Mongo predicate, so anything but a scalar or an encoded
+    # date (e.g. {"$where": ...}) is rejected rather than passed through as an operator.
+    if isinstance(value, dict) and value.keys() == {"$date"} and isinstance(value["$date"], str):
+        return datetime.fromisoformat(value["$date"])
+    if not isinstance(value, _SCALAR_TYPES):
+        raise ValueError("Invalid pagination cursor value")
+    return value
+
+
+class Cursor(NamedTuple):
+    """
+    Opaque keyset position: the sort value and unique id of the last item on a page.
+
+    Encoded as URL-safe base64 JSON so clients pass it back untouched.
+    """
+
+    value: Any
+    id: Any
+
+    def encode(self) -> str:
+        payload = orjson.dumps({"v": _encode_value(self.value), "id": _encode_value(self.id)})
+        return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "Cursor":
+        """Parse a token produced by encode(); raises ValueError if it is malformed."""
+
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            payload = orjson.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            item_id = payload["id"]
+            if isinstance(item_id, dict) and item_id.keys() == {"$oid"} and isinstance(item_id["$oid"], str):
+                item_id = ObjectId(item_id["$oid"])
+            elif not isinstance(item_id, (str, int)) or isinstance(item_id, bool):
+                raise ValueError("Invalid pagination cursor id")
+            return cls(value=_decode_value(payload["v"]), id=item_id)
+        except (KeyError, TypeError, ValueError, InvalidId) as exc:
+            raise ValueError("Invalid pagination cursor") from exc
+
+    @classmethod
+    def from_item(cls, item: Any, sort_field: str, id_field: str) -> "Cursor":
+        """Build the cursor pointing after a model instance or raw document."""
+
+        if isinstance(item, dict):
+            return cls(value=item.get(sort_field), id=item.get(id_field))
+        return cls(value=getattr(item, sort_field, None), id=getattr(item, id_field))
+
+
+def next_cursor(items: Sequence[Any], limit: int, sort_field: str, id_field: str) -> Optional[str]:
+    """Return the cursor for the following page, or None when this page was the last."""
+
+    if limit <= 0 or len(items) < limit:
+        return None
+    return Cursor.from_item(items[-1], sort_field, id_field).encode()
+
+
+def keyset_filter(cursor: Cursor, sort_field: str, direction: int, id_field: str) -> Dict[str, Any]:
+    """
+    Mongo predicate selecting documents strictly after ``cursor`` in ``(sort_field, id_field)`` order.
+
+    Results must be sorted by ``[(sort_field, direction), (id_field, direction)]``. Missing/null
+    sort values order before everything else, as they do in Mongo.
+    """
+
+    op = "$lt" if direction == DESCENDING else "$gt"
+    tie = {sort_field: cursor.value, id_field: {op: cursor.id}}
+    if cursor.value is None:
+        if direction == DESCENDING:
+            return tie
+        return {"$or": [{sort_field: {"$ne": None}}, tie]}
+    beyond: Dict[str, Any] = {sort_field: {op: cursor.value}}
+    if direction == DESCENDING:
+        # Nulls sort last in descending order, so they are still ahead of any non-null cursor.
+        return {"$or": [beyond, tie, {sort_field: None}]}
+    return {"$or": [beyond, tie]}
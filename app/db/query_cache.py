@@ -0,0 +1,73 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import orjson
+
+from app.core.config import get_settings
+
+
+class QueryCache:
+    """
+    Per-process TTL cache of materialized query results.
+
+    Keys are the JSON-serialized query arguments. Writes bump a generation counter and drop
+    every entry, and a result loaded while a write was in flight is not stored, so this
+    process never serves its own stale reads. Writes made by other workers are only picked
+    up once the entry expires (MQDB_QUERY_CACHE_TTL; 0 disables caching).
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, max_entries: int = 4096) -> None:
+        self._ttl = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+
+    @property
+    def ttl(self) -> int:
+        """Entry lifetime in seconds; defaults to MQDB_QUERY_CACHE_TTL, read on first use."""
+
+        if self._ttl is None:
+            self._ttl = get_settings().query_cache_ttl_seconds
+        return self._ttl
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        # Built on every cached read; orjson renders a nested query ~10x faster than json.dumps.
+        return orjson.dumps(parts, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str).decode()
+
+    def get_or_load(self, key: str, load: Callable[[], Any], cache_none: bool = True) -> Any:
+        """
+        Return the cached value for ``key``, calling ``load`` (outside the lock) on a miss.
+
+        With ``cache_none=False`` a None result is returned but not stored, so lookups of
+        not-yet-existing ids keep going to the database.
+        """
+
+        if self.ttl <= 0:
+            return load()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] >= time.monotonic():
+                return entry[1]
+            generation = self._generation
+        value = load()
+        if value is None and not cache_none:
+            return value
+        with self._lock:
+            if generation == self._generation:
+                self._entries.pop(key, None)
+                if len(self._entries) >= self.max_entries:
+                    # Dicts keep insertion order, so the first key is the oldest entry.
+                    self._entries.pop(next(iter(self._entries)))
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+question_query_cache = QueryCache()
@@ -1,35 +1,172 @@
 import hashlib
 import random
-from typing import Any, Dict, List, Optional, Tuple
+import struct
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from pymongo import ASCENDING, DESCENDING
 from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError
 
-from app.db.session import get_db
+from app.db.query_cache import QueryCache, question_query_cache
+from app.db.session import QUESTION_SAMPLE_INDEX, RAND_KEY_BITS, Database, get_db
 
+_SEED_INT = struct.Struct("<Q")
 
-def _normalize_seed(seed: str) -> float:
-    """Convert arbitrary seed to float in [0,1)."""
 
-    digest = hashlib.md5(seed.encode("utf-8")).hexdigest()
-    return int(digest, 16) / float(2**128)
+def _text_search(search: str) -> str:
+    """
+    $search string for a user query: multi-word queries quote every term so each must match
+    (narrowing before scoring) instead of any one of them; single words stay stemmed.
+    """
+
+    terms = search.replace('"', " ").split()
+    if len(terms) < 2:
+        return " ".join(terms)
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def _build_query(filters: Dict[str, Any], search: Optional[str]) -> Dict[str, Any]:
+    """Return the Mongo query for filters + optional text search, copying filters only when search adds to them."""
+
+    if not search:
+        return filters
+    return {**filters, "$text": {"$search": _text_search(search)}}
+
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+
+def _pins(filters: Dict[str, Any], *fields: str) -> bool:
+    """True when every field is matched by plain equality at the top level of ``filters``."""
+
+    return all(field in filters and not isinstance(filters[field], dict) for field in fields)
+
+
+@lru_cache(maxsize=512)
+def _compile_getter(dotted_key: str) -> Callable[[Dict[str, Any]], Any]:
+    """Return a lookup for ``"a.b.c"`` paths, split once; missing segments yield None."""
+
+    if "." not in dotted_key:
+        return lambda doc: doc.get(dotted_key)
+    parts = tuple(dotted_key.split("."))
+
+    def get(doc: Dict[str, Any]) -> Any:
+        current: Any = doc
+        for part in parts:
+            if not isinstance(current, dict):
+                return None
+            current = current.get(part)
+        return current
+
+    return get
+
+
+def _is_plain_equality(key: str, expected: Any) -> bool:
+    return not key.startswith("$") and expected is not None and not isinstance(expected, dict)
+
+
+def _compile_equalities(filters: Dict[str, Any]) -> Predicate:
+    """
+    Straight-line predicate for the common all-equality filter shape: one tight loop over
+    (getter, value) pairs with no operator dispatch. Array fields match if they equal or
+    contain the value, as in Mongo.
+    """
+
+    pairs = tuple((_compile_getter(key), expected) for key, expected in filters.items())
+
+    def match(doc: Dict[str, Any]) -> bool:
+        for get, expected in pairs:
+            value = get(doc)
+            if value != expected and not (isinstance(value, list) and expected in value):
+                return False
+        return True
+
+    return match
+
+
+class _Descending:
+    """Sort-key wrapper inverting comparisons, for descending fields of any comparable type."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+
+def _sort_key(doc: Dict[str, Any], order: List[Tuple[str, int]], lead: Any = None) -> Tuple[Any, ...]:
+    """Composite key sorting ``doc`` by every (field, direction) pair in a single pass."""
+
+    key = tuple(
+        _Descending(doc.get(field)) if direction == DESCENDING else doc.get(field) for field, direction in order
+    )
+    return key if lead is None else (lead, *key)
+
+
+def new_rand_key() -> int:
+    """Random sampling position for a new question, in the same range as seeds."""
+
+    return random.getrandbits(RAND_KEY_BITS)
+
+
+def _normalize_seed(seed: str) -> int:
+    """Convert arbitrary seed to a rand_key position in [0, 2**RAND_KEY_BITS)."""
+
+    digest = hashlib.blake2b(seed.encode("utf-8"), digest_size=8).digest()
+    return _SEED_INT.unpack(digest)[0] >> (64 - RAND_KEY_BITS)
 
 
 class QuestionRepo:
-    """Mongo-backed repository for display-ready question documents."""
+    """
+    Mongo-backed repository for display-ready question documents.
+
+    Projected reads, listings and counts go through a short-lived query cache that this
+    repo's writes invalidate. Full-document reads feed read-modify-write updates and
+    always hit Mongo.
 
-    def __init__(self, collection: Optional[Collection] = None) -> None:
-        db = get_db()
-        self.collection = collection or db.db["questions"]
+    Reads without an explicit projection leave out DEFAULT_EXCLUDE (the search blob, which
+    only the $text index needs) unless ``include_blob`` is set.
+    """
+
+    DEFAULT_EXCLUDE: Dict[str, int] = {"search_blob": 0}
+
+    def __init__(self, collection: Optional[Collection] = None, cache: Optional[QueryCache] = None) -> None:
+        # Collections refuse truth-value tests, so compare against None explicitly.
+        self.collection = collection if collection is not None else get_db().db["questions"]
+        self.cache = cache or question_query_cache
 
     def insert(self, doc: Dict[str, Any]) -> None:
         self.collection.insert_one(doc)
+        self.cache.invalidate()
+
+    def insert_many(self, docs: List[Dict[str, Any]], ordered: bool = False) -> None:
+        """Insert documents in one batched round-trip; unordered inserts continue past individual failures."""
+
+        if not docs:
+            return
+        try:
+            self.collection.insert_many(docs, ordered=ordered)
+        finally:
+            self.cache.invalidate()
 
     def update(self, question_id: str, patch: Dict[str, Any]) -> None:
         self.collection.update_one({"_id": question_id}, {"$set": patch})
+        self.cache.invalidate()
 
-    def find_by_id(self, question_id: str, projection: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
-        return self.collection.find_one({"_id": question_id}, projection)
+    def find_by_id(
+        self, question_id: str, projection: Optional[Dict[str, int]] = None, include_blob: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        if projection is None:
+            return self.collection.find_one({"_id": question_id}, None if include_blob else dict(self.DEFAULT_EXCLUDE))
+        key = self.cache.make_key(self.collection.full_name, "find_by_id", question_id, projection)
+        doc = self.cache.get_or_load(key, lambda: self.collection.find_one({"_id": question_id}, projection))
+        return dict(doc) if doc is not None else None
 
     def find_many(
         self,
@@ -40,13 +177,30 @@ class QuestionRepo:
         limit: int = 20,
         search: Optional[str] = None,
         include_score: bool = False,
+        include_blob: bool = False,
     ) -> List[Dict[str, Any]]:
-        query = dict(filters)
-        if search:
-            query["$text"] = {"$search": search}
-        project = dict(projection or {})
-        if include_score:
-            project["score"] = {"$meta": "textScore"}
+        if projection is None and not include_blob:
+            projection = dict(self.DEFAULT_EXCLUDE)
+        key = self.cache.make_key(
+            self.collection.full_name, "find_many", filters, projection, sort, skip, limit, search, include_score
+        )
+        docs = self.cache.get_or_load(
+            key, lambda: self._find_many(filters, projection, sort, skip, limit, search, include_score)
+        )
+        return [dict(doc) for doc in docs]
+
+    def _find_many(
+        self,
+        filters: Dict[str, Any],
+        projection: Optional[Dict[str, int]],
+        sort: Optional[List[Tuple[str, int]]],
+        skip: int,
+        limit: int,
+        search: Optional[str],
+        include_score: bool,
+    ) -> List[Dict[str, Any]]:
+        query = _build_query(filters, search)
+        project = {**(projection or {}), "score": {"$meta": "textScore"}} if include_score else projection
         cursor = self.collection.find(query, project)
         sort_fields: List[Tuple[str, Any]] = []
         if include_score:
@@ -57,37 +211,96 @@ class QuestionRepo:
             cursor = cursor.sort(sort_fields)
         if skip:
             cursor = cursor.skip(max(0, skip))
-        if limit:
-            cursor = cursor.limit(max(0, limit))
+        if limit > 0:
+            # One batch covers the page, so no getMore round-trip once limit exceeds the default 101.
+            cursor = cursor.limit(limit).batch_size(limit)
         return list(cursor)
 
     def count(self, filters: Dict[str, Any], search: Optional[str] = None) -> int:
-        query = dict(filters)
-        if search:
-            query["$text"] = {"$search": search}
-        return self.collection.count_documents(query)
+        if not filters and not search:
+            # Collection metadata instead of a full scan.
+            return self.collection.estimated_document_count()
+        query = _build_query(filters, search)
+        key = self.cache.make_key(self.collection.full_name, "count", query)
+        return self.cache.get_or_load(key, lambda: self.collection.count_documents(query))
+
+    def find_many_with_count(
+        self,
+        filters: Dict[str, Any],
+        projection: Optional[Dict[str, int]] = None,
+        sort: Optional[List[Tuple[str, int]]] = None,
+        skip: int = 0,
+        limit: int = 20,
+        search: Optional[str] = None,
+        include_score: bool = False,
+        page_filter: Optional[Dict[str, Any]] = None,
+        include_total: bool = True,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        One page of matches plus, with ``include_total``, the count of all ``filters``/``search`` matches.
+
+        The page is an indexed find().sort().limit() (a $sort inside $facet cannot use an index) and
+        the total a separate count, so keyset pages can skip it. ``page_filter`` (e.g. a keyset
+        predicate) narrows the page only.
+        """
+
+        page_filters = {"$and": [filters, page_filter]} if page_filter else filters
+        docs = self.find_many(page_filters, projection, sort, skip, limit, search, include_score)
+        return docs, self.count(filters, search=search) if include_total else None
+
+    def sample(
+        self,
+        filters: Dict[str, Any],
+        limit: int,
+        seed: Optional[str] = None,
+        projection: Optional[Dict[str, int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Pick up to ``limit`` random matching documents server-side.
+
+        Seeded calls walk the rand_key index from the seed's position (wrapping around) so the
+        same seed yields the same questions; unseeded calls use $sample. Only the sampled
+        documents, trimmed by ``projection``, cross the wire.
+
+        The wrap-around query only runs when fewer than ``limit`` matches sit above the seed
+        (roughly limit/N of seeds), so a seeded sample is almost always one round-trip. Folding
+        both halves into one aggregation sorted on a computed "wrapped" flag would instead sort
+        every match in memory, losing the index walk.
+        """
 
-    def sample(self, filters: Dict[str, Any], limit: int, seed: Optional[str] = None) -> List[Dict[str, Any]]:
         if seed:
             seed_value = _normalize_seed(seed)
-            first = list(
+            # With both status fields pinned, the sample index yields rand_key order directly;
+            # otherwise the planner picks.
+            hint = QUESTION_SAMPLE_INDEX if _pins(filters, "usage.status", "usage.is_active") else None
+            first_cursor = (
                 self.collection.find(
                     {**filters, "rand_key": {"$gte": seed_value}},
+                    projection,
                 )
                 .sort([("rand_key", ASCENDING)])
                 .limit(limit)
+                .batch_size(limit)
             )
+            if hint:
+                first_cursor = first_cursor.hint(hint)
+            first = list(first_cursor)
             remaining = limit - len(first)
             if remaining <= 0:
                 return first
-            wrap = list(
-                self.collection.find({**filters, "rand_key": {"$lt": seed_value}})
+            wrap_cursor = (
+                self.collection.find({**filters, "rand_key": {"$lt": seed_value}}, projection)
                 .sort([("rand_key", ASCENDING)])
                 .limit(remaining)
+                .batch_size(remaining)
             )
-            return first + wrap
+            if hint:
+                wrap_cursor = wrap_cursor.hint(hint)
+            return first + list(wrap_cursor)
 
         pipeline: List[Dict[str, Any]] = [{"$match": filters}, {"$sample": {"size": max(0, limit)}}]
+        if projection:
+            pipeline.append({"$project": projection})
         return list(self.collection.aggregate(pipeline))
 
 
@@ -97,19 +310,33 @@ class InMemoryQuestionRepo(QuestionRepo):
     def __init__(self) -> None:
         self.storage: Dict[str, Dict[str, Any]] = {}
 
-    def insert(self, doc: Dict[str, Any]) -> None:
-        self.storage[doc["_id"]] = dict(doc)
+    def insert(self, doc: Dict[str, Any], assume_new: bool = False) -> None:
+        """Store a copy of ``doc``; like Mongo, an existing _id raises unless the caller vouches it is new."""
+
+        stored = dict(doc)
+        if assume_new:
+            self.storage[doc["_id"]] = stored
+        elif self.storage.setdefault(doc["_id"], stored) is not stored:
+            raise DuplicateKeyError(f"duplicate _id: {doc['_id']!r}")
+
+    def insert_many(self, docs: List[Dict[str, Any]], ordered: bool = False) -> None:
+        for doc in docs:
+            self.insert(doc)
 
     def update(self, question_id: str, patch: Dict[str, Any]) -> None:
-        if question_id not in self.storage:
-            return
-        self.storage[question_id].update(patch)
+        doc = self.storage.get(question_id)
+        if doc is not None:
+            doc.update(patch)
 
-    def find_by_id(self, question_id: str, projection: Optional[Dict[str, int]] = None) -> Optional[Dict[str, Any]]:
+    def find_by_id(
+        self, question_id: str, projection: Optional[Dict[str, int]] = None, include_blob: bool = False
+    ) -> Optional[Dict[str, Any]]:
         doc = self.storage.get(question_id)
         if not doc:
             return None
-        return self._apply_projection(doc, projection)
+        if projection is None and not include_blob:
+            projection = self.DEFAULT_EXCLUDE
+        return self._compile_projection(projection)(doc)
 
     def find_many(
         self,
@@ -120,100 +347,149 @@ class InMemoryQuestionRepo(QuestionRepo):
         limit: int = 20,
         search: Optional[str] = None,
         include_score: bool = False,
+        include_blob: bool = False,
     ) -> List[Dict[str, Any]]:
-        docs = []
-        for doc in self.storage.values():
-            if self._match(doc, filters, search):
-                docs.append(self._apply_projection(doc, projection))
-        if include_score and search:
-            for d in docs:
-                d["score"] = d.get("search_blob", "").count(search.lower())
-            docs.sort(key=lambda x: (-x.get("score", 0), x.get("created_at"), x.get("_id")))
-        if sort:
-            for field, direction in reversed(sort):
-                docs.sort(key=lambda x, f=field: x.get(f), reverse=direction == DESCENDING)
-        if skip:
-            docs = docs[skip:]
-        if limit:
-            docs = docs[:limit]
-        return docs
+        # Like Mongo, filter/sort/slice the stored documents and project only the returned page.
+        match = self._compile(filters, search)
+        docs = [doc for doc in self.storage.values() if match(doc)]
+        scored = include_score and bool(search)
+        scores: Dict[Any, int] = {}
+        order = list(sort or [])
+        if scored:
+            needle = search.lower()
+            scores = {doc["_id"]: doc.get("search_blob", "").count(needle) for doc in docs}
+            # Score first, then the requested order, as the Mongo repo sorts.
+            order = order or [("created_at", ASCENDING), ("_id", ASCENDING)]
+        if scored or order:
+            docs.sort(key=lambda doc: _sort_key(doc, order, -scores[doc["_id"]] if scored else None))
+        if skip or limit:
+            docs = docs[skip : skip + limit] if limit else docs[skip:]
+        if projection is None and not include_blob:
+            projection = self.DEFAULT_EXCLUDE
+        project = self._compile_projection(projection)
+        page = [project(doc) for doc in docs]
+        if scored:
+            for doc, item in zip(docs, page):
+                item["score"] = scores[doc["_id"]]
+        return page
 
     def count(self, filters: Dict[str, Any], search: Optional[str] = None) -> int:
-        return len([1 for doc in self.storage.values() if self._match(doc, filters, search)])
+        match = self._compile(filters, search)
+        return sum(map(match, self.storage.values()))
 
-    def sample(self, filters: Dict[str, Any], limit: int, seed: Optional[str] = None) -> List[Dict[str, Any]]:
-        docs = [self._apply_projection(doc, None) for doc in self.storage.values() if self._match(doc, filters, None)]
-        if seed:
-            random.seed(seed)
-        random.shuffle(docs)
-        return docs[:limit]
+    def sample(
+        self,
+        filters: Dict[str, Any],
+        limit: int,
+        seed: Optional[str] = None,
+        projection: Optional[Dict[str, int]] = None,
+    ) -> List[Dict[str, Any]]:
+        # Reservoir sampling: one pass over the matches, only ``limit`` documents held or projected.
+        rng = random.Random(seed) if seed else random.Random()
+        match = self._compile(filters, None)
+        picked: List[Dict[str, Any]] = []
+        seen = 0
+        for doc in self.storage.values():
+            if not match(doc):
+                continue
+            if seen < limit:
+                picked.append(doc)
+            else:
+                slot = rng.randint(0, seen)
+                if slot < limit:
+                    picked[slot] = doc
+            seen += 1
+        rng.shuffle(picked)
+        project = self._compile_projection(projection)
+        return [project(doc) for doc in picked]
 
     @staticmethod
-    def _apply_projection(doc: Dict[str, Any], projection: Optional[Dict[str, int]]) -> Dict[str, Any]:
+    def _compile_projection(projection: Optional[Dict[str, int]]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+        """Split the projection into include/exclude fields once and return a per-document projector."""
+
         if projection is None:
-            return dict(doc)
-        result = {}
-        include_fields = {k for k, v in projection.items() if v}
-        exclude_fields = {k for k, v in projection.items() if not v}
+            return dict
+        include_fields = tuple(k for k, v in projection.items() if v)
         if include_fields:
-            for key in include_fields:
-                if key in doc:
-                    result[key] = doc[key]
-        else:
-            result = dict(doc)
-            for key in exclude_fields:
-                result.pop(key, None)
-        return result
+            return lambda doc: {key: doc[key] for key in include_fields if key in doc}
+        exclude_fields = frozenset(k for k, v in projection.items() if not v)
+        return lambda doc: {key: value for key, value in doc.items() if key not in exclude_fields}
 
-    @staticmethod
-    def _get_value(doc: Dict[str, Any], dotted_key: str) -> Any:
-        parts = dotted_key.split(".")
-        current: Any = doc
-        for part in parts:
-            if isinstance(current, dict) and part in current:
-                current = current[part]
-            else:
-                return None
-        return current
+    @classmethod
+    def _compile(cls, filters: Dict[str, Any], search: Optional[str]) -> Predicate:
+        """
+        Turn a filter spec into a single predicate, so operators are dispatched once per
+        query instead of once per document.
+        """
+
+        if not search and filters and all(_is_plain_equality(key, expected) for key, expected in filters.items()):
+            return _compile_equalities(filters)
+        predicates = [cls._compile_clause(key, expected) for key, expected in filters.items()]
+        if search:
+            needle = search.lower()
+            predicates.append(lambda doc: needle in str(doc.get("search_blob", "")).lower())
+        return lambda doc: all(predicate(doc) for predicate in predicates)
 
     @classmethod
-    def _match(cls, doc: Dict[str, Any], filters: Dict[str, Any], search: Optional[str]) -> bool:
-        for key, expected in filters.items():
-            value = cls._get_value(doc, key)
-            if value is None:
-                return False
-            if isinstance(expected, dict):
-                if "$gte" in expected and value < expected["$gte"]:
-                    return False
-                if "$lte" in expected and value > expected["$lte"]:
-                    return False
-                if "$in" in expected:
-                    if isinstance(value, list):
-                        if not set(value).intersection(set(expected["$in"])):
-                            return False
-                    else:
-                        if value not in expected["$in"]:
-                            return False
-                if "$elemMatch" in expected:
-                    target = expected["$elemMatch"]
-                    if not isinstance(value, list):
-                        return False
-                    if not any(item in target.get("$in", []) for item in value):
-                        return False
-                continue
+    def _compile_clause(cls, key: str, expected: Any) -> Predicate:
+        if key in ("$and", "$or"):
+            clauses = [cls._compile(clause, None) for clause in expected]
+            combine = all if key == "$and" else any
+            return lambda doc: combine(clause(doc) for clause in clauses)
+        get = _compile_getter(key)
+        if isinstance(expected, dict) and "$exists" in expected:
+            exists = bool(expected["$exists"])
+            return lambda doc: (get(doc) is not None) == exists
+        if isinstance(expected, dict) and "$ne" in expected:
+            unwanted = expected["$ne"]
+            return lambda doc: get(doc) != unwanted
+        if expected is None:
+            return lambda doc: get(doc) is None
+        if isinstance(expected, dict):
+            checks = cls._compile_operators(expected)
+            return lambda doc: (value := get(doc)) is not None and all(check(value) for check in checks)
+
+        def equals(doc: Dict[str, Any]) -> bool:
+            value = get(doc)
             if isinstance(value, list):
-                if expected not in value and value != expected:
-                    return False
-            elif value != expected:
-                return False
-        if search:
-            blob = str(doc.get("search_blob", "")).lower()
-            if search.lower() not in blob:
-                return False
-        return True
+                return expected in value or value == expected
+            return value is not None and value == expected
+
+        return equals
+
+    @staticmethod
+    def _compile_operators(expected: Dict[str, Any]) -> List[Callable[[Any], bool]]:
+        checks: List[Callable[[Any], bool]] = []
+        if "$gte" in expected:
+            checks.append(lambda value, bound=expected["$gte"]: not value < bound)
+        if "$lte" in expected:
+            checks.append(lambda value, bound=expected["$lte"]: not value > bound)
+        if "$gt" in expected:
+            checks.append(lambda value, bound=expected["$gt"]: value > bound)
+        if "$lt" in expected:
+            checks.append(lambda value, bound=expected["$lt"]: value < bound)
+        if "$in" in expected:
+            candidates = set(expected["$in"])
+            checks.append(
+                lambda value: not candidates.isdisjoint(value) if isinstance(value, list) else value in candidates
+            )
+        if "$elemMatch" in expected:
+            targets = set(expected["$elemMatch"].get("$in", []))
+            checks.append(lambda value: isinstance(value, list) and not targets.isdisjoint(value))
+        return checks
+
+
+# (Database instance, repo bound to it); rebuilt only when get_db() hands out a new Database.
+_repo_cache: Tuple[Optional[Database], Optional[QuestionRepo]] = (None, None)
 
 
 def get_question_repo() -> QuestionRepo:
-    """Return a repo bound to the shared Database instance."""
+    """Return the shared repo bound to the shared Database instance (it holds no per-request state)."""
 
-    return QuestionRepo()
+    global _repo_cache
+    db = get_db()
+    cached_db, repo = _repo_cache
+    if cached_db is not db or repo is None:
+        repo = QuestionRepo(db.db["questions"])
+        _repo_cache = (db, repo)
+    return repo
@@ -0,0 +1,33 @@
+import logging
+from functools import lru_cache
+from typing import Optional
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache()
+def get_redis() -> Optional[Redis]:
+    """Return the shared Redis client, or None when MQDB_REDIS_URL is not configured."""
+
+    url = get_settings().redis_url
+    if not url:
+        return None
+    return Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+
+def warm_redis() -> None:
+    """Open the first pooled Redis connection at startup instead of on the first rate-limited request."""
+
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.ping()
+    except RedisError as exc:
+        # Callers already fall back when Redis is down; startup should not fail over it either.
+        logger.warning("Redis warm-up failed: %s", exc)
@@ -1,15 +1,37 @@
+import logging
+import re
+import threading
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Set, Type, TypeVar
 
-from pymongo import ASCENDING, DESCENDING, MongoClient
+from bson.codec_options import DatetimeConversion
+from pydantic import BaseModel, TypeAdapter
+from pymongo import ASCENDING, DESCENDING, IndexModel, MongoClient, UpdateOne
+from pymongo.collection import Collection
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from pymongo.cursor import Cursor as PyMongoCursor
 
 from app.core.config import get_settings
+from app.db.pagination import Cursor, keyset_filter, resolve_sort_field
+from app.db.query_cache import QueryCache
 
 from app.schemas.exam import ExamResponse, ExamSyllabusItem
 from app.schemas.master import SubjectResponse, TopicResponse
 from app.schemas.question import OptionSchema, QuestionResponse, QuestionType
 from app.schemas.test_instructions import TestInstructionsResponse, InstructionBlock, ProctoringRules
-from app.schemas.test import QuestionReference, TestResponse, TestSection, SectionMarkingScheme, TestPattern
+from app.schemas.test import (
+    Availability,
+    AvailabilityMode,
+    QuestionReference,
+    ReleaseMode,
+    SectionMarkingScheme,
+    SolutionsConfig,
+    TestPattern,
+    TestResponse,
+    TestSection,
+    TestSettings,
+    TestStatus,
+)
 from app.schemas.test_series import (
     SyllabusCoverageItem,
     TestSeriesResponse,
@@ -20,7 +42,70 @@ from app.schemas.test_series import (
 )
 
 
+logger = logging.getLogger(__name__)
+
+QUESTION_TEXT_INDEX = "question_search_text"
+# createIndexes error codes: IndexNotFound, IndexOptionsConflict, IndexKeySpecsConflict.
+_INDEX_NOT_FOUND = 27
+_INDEX_CONFLICT_CODES = (85, 86)
+QUESTION_SAMPLE_INDEX = "question_sample_rand_key"
+# rand_key values are non-negative int64s: [0, 2**RAND_KEY_BITS).
+RAND_KEY_BITS = 63
+# Legacy question documents, i.e. anything written before schema_version=2. Spelled as an
+# $or of index-friendly predicates rather than {"$ne": 2}, which can't be turned into bounds.
+LEGACY_QUESTION_FILTER = {"$or": [{"schema_version": {"$exists": False}}, {"schema_version": {"$lt": 2}}]}
+# Write-only derived fields (the text-search blob, the sampling key) that _question_from_doc
+# never reads; every question read excludes them.
+QUESTION_READ_PROJECTION = {"search_blob": 0, "rand_key": 0}
+
+# getMore size for unbounded scans, so streaming callers hold one batch rather than the collection.
+STREAM_BATCH_SIZE = 500
+
+# Whitelisted sort fields per listing; the first entry is the default.
+SUBJECT_SORT_FIELDS = ("name", "created_at", "updated_at", "slug")
+TEST_SERIES_SORT_FIELDS = ("display_order", "created_at", "updated_at", "name", "published_at")
+TEST_SORT_FIELDS = ("test_number", "created_at", "updated_at", "name")
+# Top-level test fields update_test_fields may $set; identifiers and created_at never change.
+TEST_MUTABLE_FIELDS = frozenset(
+    {
+        "name",
+        "description",
+        "pattern",
+        "settings",
+        "solutions",
+        "availability",
+        "is_active",
+        "status",
+        "tags",
+        "version",
+        "language",
+        "metadata",
+        "questions",
+        "updated_at",
+    }
+)
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Stored question types are plain strings; a dict lookup is much cheaper than QuestionType(value)
+# in the per-reference hydration loops.
+_QTYPE_BY_VALUE: Dict[str, QuestionType] = {member.value: member for member in QuestionType}
+# Dumps a whole batch in one serializer call instead of one model_dump per question.
+_QUESTION_LIST_ADAPTER: TypeAdapter[List[QuestionResponse]] = TypeAdapter(List[QuestionResponse])
+# schema_version=2 question types mapped onto the legacy QuestionType.
+_V2_TYPE_MAP: Dict[str, QuestionType] = {
+    "single_choice": QuestionType.MCQ,
+    "multi_choice": QuestionType.MSQ,
+    "integer": QuestionType.NAT,
+    "short_text": QuestionType.NAT,
+    "true_false": QuestionType.MCQ,
+}
+
+
 def _dt(value: datetime) -> datetime:
+    """Coerce a timestamp from an imported (schema_version=2) question, which may be ISO text."""
+
     return value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
 
 
@@ -36,66 +121,372 @@ class Database:
         settings = get_settings()
         self.uri = uri or settings.mongo_uri
         self.db_name = db_name or settings.mongo_db_name
-        self.client = MongoClient(self.uri)
+        max_pool = settings.mongo_max_pool_size
+        if settings.mongo_max_pool_total:
+            # Split the server-wide connection budget evenly across worker processes.
+            max_pool = max(1, settings.mongo_max_pool_total // settings.web_workers)
+        # One pooled client per process; every request handler shares it through get_db().
+        self.client = MongoClient(
+            self.uri,
+            maxPoolSize=max_pool,
+            minPoolSize=min(settings.mongo_min_pool_size, max_pool),
+            maxIdleTimeMS=settings.mongo_max_idle_time_ms or None,
+            waitQueueTimeoutMS=settings.mongo_wait_queue_timeout_ms or None,
+            serverSelectionTimeoutMS=settings.mongo_server_selection_timeout_ms,
+            socketTimeoutMS=settings.mongo_socket_timeout_ms or None,
+            retryWrites=True,
+            compressors=settings.mongo_compressors,
+            w=int(settings.mongo_write_concern) if settings.mongo_write_concern.isdigit() else settings.mongo_write_concern,
+            # Timestamps this service writes are BSON dates; decoding them as naive datetimes and
+            # clamping out-of-range values means readers never need to re-check or re-parse them.
+            tz_aware=False,
+            datetime_conversion=DatetimeConversion.DATETIME_CLAMP,
+        )
         self.db = self.client[self.db_name]
-        self._init_indexes()
-
-    def _init_indexes(self) -> None:
-        self.db.subjects.create_index([("slug", ASCENDING)], unique=True)
-        self.db.topics.create_index([("subject_id", ASCENDING), ("slug", ASCENDING)], unique=True)
-        self.db.exams.create_index([("code", ASCENDING)], unique=True)
-        self.db.questions.create_index([("subject_id", ASCENDING)])
-        self.db.questions.create_index([("difficulty", ASCENDING), ("is_active", ASCENDING)])
-        # Question document (v2) indexes
-        self.db.questions.create_index([("schema_version", ASCENDING)])
-        self.db.questions.create_index([("taxonomy.subject_id", ASCENDING)])
-        self.db.questions.create_index([("taxonomy.topic_ids", ASCENDING)])
-        self.db.questions.create_index([("taxonomy.target_exam_ids", ASCENDING)])
-        self.db.questions.create_index([("difficulty", ASCENDING)])
-        self.db.questions.create_index([("tags", ASCENDING)])
-        self.db.questions.create_index([("usage.is_active", ASCENDING)])
-        self.db.questions.create_index([("usage.status", ASCENDING)])
-        self.db.questions.create_index(
-            [("usage.is_active", ASCENDING), ("usage.status", ASCENDING), ("taxonomy.subject_id", ASCENDING), ("difficulty", ASCENDING)]
+        self._indexes_done = False
+        self._trust_schema = settings.trust_db_schema
+        # Hydrated subjects/topics/exams by id, slug or code; cleared by any master write. With Redis
+        # the response cache is shared, and a body built from this worker's stale masters after another
+        # worker's write would be stored for every worker, so masters are only cached per process
+        # when responses are too.
+        master_ttl = 0 if settings.redis_url else settings.master_cache_ttl_seconds
+        self._masters = QueryCache(ttl_seconds=master_ttl, max_entries=1024)
+
+    def close(self) -> None:
+        """Close the pooled client and its connections."""
+
+        self.client.close()
+
+    def ensure_indexes(self) -> None:
+        """Create missing indexes once per instance (worker startup, not import); existing ones are never dropped."""
+
+        if self._indexes_done:
+            return
+        self._init_indexes(rebuild=False)
+        self._indexes_done = True
+
+    def migrate(self) -> None:
+        """
+        One-off deploy step (``python -m app.db.init_indexes``): also rebuild indexes whose options
+        changed and run data migrations.
+
+        Kept out of worker startup, where every worker would drop the same index at once (all but the
+        first failing with IndexNotFound) and rewrite the same documents on every boot.
+        """
+
+        self._init_indexes(rebuild=True)
+        self._indexes_done = True
+        self._ensure_int_rand_keys()
+
+    def _init_indexes(self, rebuild: bool) -> None:
+        # One createIndexes command per collection instead of a round-trip per index.
+        self.db.subjects.create_indexes(
+            [
+                IndexModel([("slug", ASCENDING)], unique=True),
+                # Listing indexes: equality filters first, then the sort key and its keyset tiebreaker,
+                # so filtered + sorted pages are served by an IXSCAN instead of an in-memory SORT.
+                IndexModel([("is_active", ASCENDING), ("name", ASCENDING), ("id", ASCENDING)]),
+            ]
+        )
+        self.db.topics.create_indexes([IndexModel([("subject_id", ASCENDING), ("slug", ASCENDING)], unique=True)])
+        self.db.exams.create_indexes([IndexModel([("code", ASCENDING)], unique=True)])
+        self._create_indexes_replacing_changed(
+            self.db.questions,
+            [
+                IndexModel([("subject_id", ASCENDING)]),
+                IndexModel([("difficulty", ASCENDING), ("is_active", ASCENDING)]),
+                # Question document (v2) indexes
+                IndexModel([("schema_version", ASCENDING)]),
+                # Taxonomy fields only exist on v2 documents and are only queried by value, so
+                # sparse indexes skip legacy rows without losing any query that can use them.
+                IndexModel([("taxonomy.subject_id", ASCENDING)], sparse=True),
+                IndexModel([("taxonomy.topic_ids", ASCENDING)], sparse=True),
+                IndexModel([("taxonomy.target_exam_ids", ASCENDING)], sparse=True),
+                IndexModel([("difficulty", ASCENDING)]),
+                IndexModel([("tags", ASCENDING)]),
+                IndexModel([("usage.is_active", ASCENDING)]),
+                IndexModel([("usage.status", ASCENDING)]),
+                # Seeded sampling walks rand_key from the seed's position; the status prefix keeps
+                # that walk in rand_key order for the default published + active filter.
+                IndexModel([("rand_key", ASCENDING)]),
+                IndexModel(
+                    [("usage.status", ASCENDING), ("usage.is_active", ASCENDING), ("rand_key", ASCENDING)],
+                    name=QUESTION_SAMPLE_INDEX,
+                ),
+                IndexModel(
+                    [
+                        ("usage.is_active", ASCENDING),
+                        ("usage.status", ASCENDING),
+                        ("taxonomy.subject_id", ASCENDING),
+                        ("difficulty", ASCENDING),
+                    ]
+                ),
+                IndexModel([("taxonomy.subject_id", ASCENDING), ("taxonomy.topic_ids", ASCENDING), ("difficulty", ASCENDING)]),
+                # Discovery defaults: published + active, optionally by subject, newest first.
+                IndexModel(
+                    [
+                        ("usage.status", ASCENDING),
+                        ("usage.is_active", ASCENDING),
+                        ("taxonomy.subject_id", ASCENDING),
+                        ("created_at", DESCENDING),
+                        ("_id", DESCENDING),
+                    ]
+                ),
+                IndexModel(
+                    [("taxonomy.subject_id", ASCENDING), ("taxonomy.topic_ids", ASCENDING), ("created_at", DESCENDING)],
+                    partialFilterExpression={"usage.status": "published"},
+                ),
+            ],
+            rebuild,
+        )
+        self._ensure_question_text_index(rebuild)
+        self.db.test_series.create_indexes(
+            [
+                IndexModel([("series_id", ASCENDING)], unique=True),
+                IndexModel([("code", ASCENDING)], unique=True),
+                IndexModel([("slug", ASCENDING)], unique=True),
+                IndexModel([("target_exam_id", ASCENDING), ("is_active", ASCENDING)]),
+                IndexModel([("status", ASCENDING), ("is_active", ASCENDING), ("display_order", ASCENDING)]),
+                IndexModel(
+                    [("exam_id", ASCENDING), ("status", ASCENDING), ("display_order", ASCENDING), ("series_id", ASCENDING)]
+                ),
+                IndexModel([("tags", ASCENDING)]),
+                IndexModel([("available_from", ASCENDING)]),
+                IndexModel([("available_until", ASCENDING)]),
+            ]
+        )
+        self.db.tests.create_indexes(
+            [
+                IndexModel([("test_id", ASCENDING)], unique=True),
+                IndexModel([("code", ASCENDING)], unique=True),
+                IndexModel([("slug", ASCENDING)], unique=True),
+                IndexModel([("series_id", ASCENDING), ("test_number", ASCENDING)], unique=True),
+                IndexModel([("series_id", ASCENDING), ("status", ASCENDING), ("is_active", ASCENDING)]),
+                IndexModel(
+                    [("series_id", ASCENDING), ("is_active", ASCENDING), ("test_number", ASCENDING), ("test_id", ASCENDING)]
+                ),
+                IndexModel([("questions.question_id", ASCENDING)]),
+                IndexModel([("status", ASCENDING), ("availability.starts_at", ASCENDING)]),
+            ]
         )
+        self.db.test_instructions.create_indexes([IndexModel([("test_id", ASCENDING)], unique=True)])
+
+    @staticmethod
+    def _page(
+        collection: Collection,
+        query: dict,
+        projection: Optional[dict],
+        sort_field: str,
+        sort_dir: int,
+        id_field: str,
+        skip: int,
+        limit: int,
+        cursor: Optional[Cursor],
+    ) -> PyMongoCursor:
+        """
+        Run a sorted, paginated find.
+
+        With a cursor the page starts right after it via a keyset predicate on
+        (sort_field, id_field), so deep pages cost the same as the first; otherwise
+        the legacy skip offset is applied.
+        """
+
+        if cursor is not None:
+            query = {"$and": [query, keyset_filter(cursor, sort_field, sort_dir, id_field)]}
+        docs = collection.find(query, projection).sort([(sort_field, sort_dir), (id_field, sort_dir)])
+        if cursor is None:
+            docs = docs.skip(max(0, skip))
+        if limit > 0:
+            # Fetch the whole page in the first batch instead of 101 documents plus a getMore.
+            docs = docs.batch_size(limit)
+        return docs.limit(limit)
+
+    def _page_with_total(
+        self,
+        collection: Collection,
+        query: dict,
+        projection: Optional[dict],
+        sort_field: str,
+        sort_dir: int,
+        id_field: str,
+        skip: int,
+        limit: int,
+        cursor: Optional[Cursor],
+        include_total: bool,
+    ) -> tuple[Iterable[dict], Optional[int]]:
+        """
+        Like _page, plus the count of everything matching ``query`` (None unless include_total).
+
+        The page stays an indexed find().sort().limit() (a $sort inside $facet cannot use an
+        index and sorts every match in memory); the total is a separate count_documents that
+        callers request only for the first page.
+        """
+
+        docs = self._page(collection, query, projection, sort_field, sort_dir, id_field, skip, limit, cursor)
+        return docs, collection.count_documents(query) if include_total else None
+
+    def _ensure_int_rand_keys(self, batch_size: int = 1000) -> None:
+        """
+        Rescale legacy float rand_key values in [0, 1) onto the int64 range.
+
+        Integer keys index and compare faster; scaling keeps each question's relative
+        position, so existing seeds still spread across the whole collection.
+        """
+
+        legacy = self.db.questions.find({"rand_key": {"$type": "double"}}, {"rand_key": 1})
+        batch: List[UpdateOne] = []
+        for doc in legacy:
+            scaled = min(int(doc["rand_key"] * 2**RAND_KEY_BITS), 2**RAND_KEY_BITS - 1)
+            batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"rand_key": scaled}}))
+            if len(batch) >= batch_size:
+                self.db.questions.bulk_write(batch, ordered=False)
+                batch = []
+        if batch:
+            self.db.questions.bulk_write(batch, ordered=False)
+
+    @classmethod
+    def _create_indexes_replacing_changed(cls, collection: Collection, models: List[IndexModel], rebuild: bool) -> None:
+        """
+        create_indexes; with ``rebuild``, first drop any same-named index whose sparse/unique flag changed.
+
+        Mongo rejects re-creating an index under its existing name with new options. Without
+        ``rebuild`` (worker startup) such an index is kept as it is and logged, and the others are
+        still created. Only these boolean flags are compared; richer options may come back
+        normalized and would cause needless rebuilds.
+        """
+
+        if rebuild:
+            existing = collection.index_information()
+            for model in models:
+                spec = model.document
+                current = existing.get(spec["name"])
+                if current and any(bool(current.get(flag)) != bool(spec.get(flag)) for flag in ("sparse", "unique")):
+                    cls._drop_index(collection, spec["name"])
+        try:
+            collection.create_indexes(models)
+        except OperationFailure as exc:
+            if exc.code not in _INDEX_CONFLICT_CODES:
+                raise
+            # One conflicting spec fails the whole batch, so create the rest one at a time.
+            for model in models:
+                try:
+                    collection.create_indexes([model])
+                except OperationFailure as exc:
+                    if exc.code not in _INDEX_CONFLICT_CODES:
+                        raise
+                    logger.warning(
+                        "Index %s on %s has changed; run `python -m app.db.init_indexes` to rebuild it",
+                        model.document["name"],
+                        collection.name,
+                    )
+
+    @staticmethod
+    def _drop_index(collection: Collection, name: str) -> None:
+        """drop_index that tolerates the index already being gone (e.g. dropped by a concurrent run)."""
+
+        try:
+            collection.drop_index(name)
+        except OperationFailure as exc:
+            if exc.code != _INDEX_NOT_FOUND:
+                raise
+
+    def _ensure_question_text_index(self, rebuild: bool) -> None:
+        """
+        Weighted $text index backing question search.
+
+        Matches in the question text and tags rank above matches that only hit the
+        normalized blob (options, taxonomy ids). A collection can hold a single text
+        index, so with ``rebuild`` an existing one with different weights (e.g. the
+        original blob-only index) is dropped and rebuilt. Workers keep serving search
+        from the old index instead: dropping it at their startup would race the other
+        workers and fail their $text queries until the rebuild finished.
+        """
+
+        weights = {"text": 10, "tags": 5, "search_blob": 1}
+        existing = self.db.questions.index_information().get(QUESTION_TEXT_INDEX)
+        if existing and existing.get("weights") != weights:
+            if not rebuild:
+                logger.warning(
+                    "Index %s on questions has changed; run `python -m app.db.init_indexes` to rebuild it",
+                    QUESTION_TEXT_INDEX,
+                )
+                return
+            self._drop_index(self.db.questions, QUESTION_TEXT_INDEX)
         self.db.questions.create_index(
-            [("taxonomy.subject_id", ASCENDING), ("taxonomy.topic_ids", ASCENDING), ("difficulty", ASCENDING)]
+            [(field, "text") for field in weights],
+            name=QUESTION_TEXT_INDEX,
+            weights=weights,
         )
-        self.db.questions.create_index([("search_blob", "text")], name="question_search_text")
-        self.db.test_series.create_index([("series_id", ASCENDING)], unique=True)
-        self.db.test_series.create_index([("code", ASCENDING)], unique=True)
-        self.db.test_series.create_index([("slug", ASCENDING)], unique=True)
-        self.db.test_series.create_index([("target_exam_id", ASCENDING), ("is_active", ASCENDING)])
-        self.db.test_series.create_index([("status", ASCENDING), ("is_active", ASCENDING), ("display_order", ASCENDING)])
-        self.db.test_series.create_index([("tags", ASCENDING)])
-        self.db.test_series.create_index([("available_from", ASCENDING)])
-        self.db.test_series.create_index([("available_until", ASCENDING)])
-        self.db.tests.create_index([("test_id", ASCENDING)], unique=True)
-        self.db.tests.create_index([("code", ASCENDING)], unique=True)
-        self.db.tests.create_index([("slug", ASCENDING)], unique=True)
-        self.db.tests.create_index([("series_id", ASCENDING), ("test_number", ASCENDING)], unique=True)
-        self.db.tests.create_index([("series_id", ASCENDING), ("status", ASCENDING), ("is_active", ASCENDING)])
-        self.db.tests.create_index([("questions.question_id", ASCENDING)])
-        self.db.tests.create_index([("status", ASCENDING), ("availability.starts_at", ASCENDING)])
-        self.db.test_instructions.create_index([("test_id", ASCENDING)], unique=True)
+
+    @staticmethod
+    def _serialize(model: BaseModel) -> dict:
+        """
+        Document for an insert or full replace: None-valued fields are left out.
+
+        Every reader treats a missing optional field as None, so nothing is lost and documents
+        stay smaller. Partial $set updates keep their Nones so a field can still be cleared.
+        """
+
+        return model.model_dump(exclude_none=True)
 
     # Subject methods
+    def _master_lookup(self, collection: str, query: dict, from_doc: Callable[[dict], ModelT]) -> Optional[ModelT]:
+        """find_one on a master collection through the per-process master cache; misses are not cached."""
+
+        def load() -> Optional[ModelT]:
+            doc = self.db[collection].find_one(query)
+            return from_doc(doc) if doc else None
+
+        return self._masters.get_or_load(self._masters.make_key(collection, query), load, cache_none=False)
+
     def insert_subject(self, subject: SubjectResponse) -> None:
-        self.db.subjects.insert_one(subject.model_dump())
+        self.db.subjects.insert_one(self._serialize(subject))
+        self._masters.invalidate()
+
+    def insert_subjects(self, subjects: List[SubjectResponse]) -> None:
+        """Insert many subjects in one unordered insert_many round-trip."""
+
+        if not subjects:
+            return
+        try:
+            self.db.subjects.insert_many([self._serialize(subject) for subject in subjects], ordered=False)
+        finally:
+            self._masters.invalidate()
+
+    def find_subject_slugs(self, slugs: Iterable[str]) -> Set[str]:
+        """Return which of ``slugs`` already belong to a subject, using one $in query."""
+
+        wanted = list(set(slugs))
+        if not wanted:
+            return set()
+        return {doc["slug"] for doc in self.db.subjects.find({"slug": {"$in": wanted}}, {"slug": 1, "_id": 0})}
 
     def update_subject(self, subject: SubjectResponse) -> None:
-        self.db.subjects.update_one({"id": subject.id}, {"$set": subject.dict(exclude={"id", "created_at"})})
+        self.db.subjects.update_one({"id": subject.id}, {"$set": subject.model_dump(exclude={"id", "created_at"})})
+        self._masters.invalidate()
 
     def delete_subject(self, subject_id: str) -> None:
         self.db.subjects.delete_one({"id": subject_id})
+        self._masters.invalidate()
 
     def get_subject(self, subject_id: str) -> Optional[SubjectResponse]:
-        doc = self.db.subjects.find_one({"id": subject_id})
-        return self._subject_from_doc(doc) if doc else None
+        return self._master_lookup("subjects", {"id": subject_id}, self._subject_from_doc)
 
     def get_subject_by_slug(self, slug: str) -> Optional[SubjectResponse]:
-        doc = self.db.subjects.find_one({"slug": slug})
-        return self._subject_from_doc(doc) if doc else None
+        return self._master_lookup("subjects", {"slug": slug}, self._subject_from_doc)
+
+    def get_subjects_by_ids(self, subject_ids: Iterable[str]) -> Dict[str, SubjectResponse]:
+        """Fetch several subjects in one round-trip, keyed by id; unknown ids are simply absent."""
+
+        ids = list(set(subject_ids))
+        if not ids:
+            return {}
+        return {doc["id"]: self._subject_from_doc(doc) for doc in self.db.subjects.find({"id": {"$in": ids}})}
+
+    def has_subjects(self) -> bool:
+        """Cheap emptiness probe: fetches at most one `_id` instead of counting or listing subjects."""
+
+        return self.db.subjects.find_one({}, {"_id": 1}) is not None
 
     def list_subjects(
         self,
@@ -107,30 +498,42 @@ class Database:
         sort_by: str = "name",
         sort_order: str = "asc",
         include_total: bool = False,
-    ) -> tuple[List[SubjectResponse], int]:
+        cursor: Optional[Cursor] = None,
+    ) -> tuple[List[SubjectResponse], Optional[int]]:
         query: dict = {}
         if is_active is not None:
             query["is_active"] = is_active
         if search:
-            query["name"] = {"$regex": search, "$options": "i"}
+            # Escaped and anchored: a literal prefix stops at the first mismatching character and
+            # can't be turned into a pathological pattern by user input.
+            query["name"] = {"$regex": f"^{re.escape(search)}", "$options": "i"}
         if tags:
             query["tags"] = {"$all": tags}
 
-        sort_fields = {"name": "name", "created_at": "created_at", "updated_at": "updated_at", "slug": "slug"}
-        sort_field = sort_fields.get(sort_by, "name")
+        sort_field = resolve_sort_field(sort_by, SUBJECT_SORT_FIELDS)
         sort_dir = ASCENDING if sort_order.lower() != "desc" else DESCENDING
 
-        total = self.db.subjects.count_documents(query) if include_total else 0
-        cursor = (
-            self.db.subjects.find(query)
-            .skip(max(0, skip))
-            .limit(limit)
-            .sort([(sort_field, sort_dir)])
+        docs, total = self._page_with_total(
+            self.db.subjects, query, None, sort_field, sort_dir, "id", skip, limit, cursor, include_total
         )
-        return [self._subject_from_doc(doc) for doc in cursor], total
+        return [self._subject_from_doc(doc) for doc in docs], total
+
+    def _hydrate(self, model: Type[ModelT], **fields: Any) -> ModelT:
+        """
+        Build a read model from a stored document.
+
+        Documents were validated on write, so when MQDB_TRUST_DB_SCHEMA is on (the default)
+        the model is constructed without re-running validation. Callers must coerce every value
+        themselves, enums and nested models included, since model_construct does neither.
+        """
+
+        if self._trust_schema:
+            return model.model_construct(**fields)
+        return model(**fields)
 
     def _subject_from_doc(self, doc: dict) -> SubjectResponse:
-        return SubjectResponse(
+        return self._hydrate(
+            SubjectResponse,
             id=doc["id"],
             name=doc["name"],
             slug=doc["slug"],
@@ -138,34 +541,53 @@ class Database:
             tags=doc.get("tags", []),
             metadata=doc.get("metadata"),
             is_active=bool(doc.get("is_active", True)),
-            created_at=_dt(doc["created_at"]),
-            updated_at=_dt(doc["updated_at"]),
+            created_at=doc["created_at"],
+            updated_at=doc["updated_at"],
         )
 
     # Topic methods
     def insert_topic(self, topic: TopicResponse) -> None:
-        self.db.topics.insert_one(topic.model_dump())
+        self.db.topics.insert_one(self._serialize(topic))
+        self._masters.invalidate()
 
     def update_topic(self, topic: TopicResponse) -> None:
-        self.db.topics.update_one({"id": topic.id}, {"$set": topic.dict(exclude={"id", "created_at"})})
+        self.db.topics.update_one({"id": topic.id}, {"$set": topic.model_dump(exclude={"id", "created_at"})})
+        self._masters.invalidate()
 
     def delete_topic(self, topic_id: str) -> None:
         self.db.topics.delete_one({"id": topic_id})
+        self._masters.invalidate()
 
     def get_topic(self, topic_id: str) -> Optional[TopicResponse]:
-        doc = self.db.topics.find_one({"id": topic_id})
-        return self._topic_from_doc(doc) if doc else None
+        return self._master_lookup("topics", {"id": topic_id}, self._topic_from_doc)
 
     def get_topic_by_slug(self, subject_id: str, slug: str) -> Optional[TopicResponse]:
-        doc = self.db.topics.find_one({"subject_id": subject_id, "slug": slug})
-        return self._topic_from_doc(doc) if doc else None
+        return self._master_lookup("topics", {"subject_id": subject_id, "slug": slug}, self._topic_from_doc)
+
+    def get_topics_by_ids(self, topic_ids: Iterable[str]) -> Dict[str, TopicResponse]:
+        """Fetch several topics in one round-trip, keyed by id; unknown ids are simply absent."""
+
+        ids = list(set(topic_ids))
+        if not ids:
+            return {}
+        return {doc["id"]: self._topic_from_doc(doc) for doc in self.db.topics.find({"id": {"$in": ids}})}
+
+    def has_topics_for_subject(self, subject_id: str) -> bool:
+        """Existence probe answered from the (subject_id, slug) index alone, without loading a topic."""
+
+        return self.db.topics.find_one({"subject_id": subject_id}, {"_id": 0, "subject_id": 1}) is not None
 
     def list_topics(self, subject_id: Optional[str] = None) -> List[TopicResponse]:
+        return list(self.iter_topics(subject_id))
+
+    def iter_topics(self, subject_id: Optional[str] = None, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[TopicResponse]:
         query = {"subject_id": subject_id} if subject_id else {}
-        return [self._topic_from_doc(doc) for doc in self.db.topics.find(query)]
+        for doc in self.db.topics.find(query).batch_size(batch_size):
+            yield self._topic_from_doc(doc)
 
     def _topic_from_doc(self, doc: dict) -> TopicResponse:
-        return TopicResponse(
+        return self._hydrate(
+            TopicResponse,
             id=doc["id"],
             subject_id=doc["subject_id"],
             name=doc["name"],
@@ -178,39 +600,39 @@ class Database:
             tags=doc.get("tags", []),
             metadata=doc.get("metadata"),
             is_active=bool(doc.get("is_active", True)),
-            created_at=_dt(doc["created_at"]),
-            updated_at=_dt(doc["updated_at"]),
+            created_at=doc["created_at"],
+            updated_at=doc["updated_at"],
         )
 
     # Exam methods
     def insert_exam(self, exam: ExamResponse) -> None:
-        payload = exam.model_dump()
-        payload["syllabus"] = [item.model_dump() for item in exam.syllabus]
-        self.db.exams.insert_one(payload)
+        self.db.exams.insert_one(self._serialize(exam))
+        self._masters.invalidate()
 
     def update_exam(self, exam: ExamResponse) -> None:
         payload = exam.model_dump(exclude={"exam_id", "created_at"})
         payload["syllabus"] = [item.model_dump() for item in exam.syllabus]
         self.db.exams.update_one({"exam_id": exam.exam_id}, {"$set": payload})
+        self._masters.invalidate()
 
     def delete_exam(self, exam_id: str) -> None:
         self.db.exams.delete_one({"exam_id": exam_id})
+        self._masters.invalidate()
 
     def get_exam(self, exam_id: str) -> Optional[ExamResponse]:
-        doc = self.db.exams.find_one({"exam_id": exam_id})
-        return self._exam_from_doc(doc) if doc else None
+        return self._master_lookup("exams", {"exam_id": exam_id}, self._exam_from_doc)
 
     def get_exam_by_code(self, code: str) -> Optional[ExamResponse]:
-        doc = self.db.exams.find_one({"code": code})
-        return self._exam_from_doc(doc) if doc else None
+        return self._master_lookup("exams", {"code": code}, self._exam_from_doc)
 
     def list_exams(self, active_only: bool = False) -> List[ExamResponse]:
         query = {"is_active": True} if active_only else {}
         return [self._exam_from_doc(doc) for doc in self.db.exams.find(query)]
 
     def _exam_from_doc(self, doc: dict) -> ExamResponse:
-        syllabus = [ExamSyllabusItem(**item) for item in doc.get("syllabus", [])]
-        return ExamResponse(
+        syllabus = [self._hydrate(ExamSyllabusItem, **item) for item in doc.get("syllabus", [])]
+        return self._hydrate(
+            ExamResponse,
             exam_id=doc["exam_id"],
             code=doc["code"],
             name=doc["name"],
@@ -220,35 +642,56 @@ class Database:
             is_active=bool(doc.get("is_active", True)),
             metadata=doc.get("metadata"),
             created_by=doc.get("created_by"),
-            created_at=_dt(doc["created_at"]),
-            updated_at=_dt(doc["updated_at"]),
+            created_at=doc["created_at"],
+            updated_at=doc["updated_at"],
         )
 
     # Question methods
+    @staticmethod
+    def _question_payload(question: QuestionResponse, exclude: Optional[set] = None, exclude_none: bool = False) -> dict:
+        """Dump a question in one recursive pass (options included)."""
+
+        return question.model_dump(exclude=exclude, exclude_none=exclude_none)
+
     def insert_question(self, question: QuestionResponse) -> None:
-        payload = question.model_dump()
-        payload["options"] = [opt.model_dump() for opt in question.options]
-        self.db.questions.insert_one(payload)
+        self.db.questions.insert_one(self._question_payload(question, exclude_none=True))
+
+    def insert_questions(self, questions: List[QuestionResponse]) -> None:
+        """
+        Insert several questions in one batched round-trip.
+
+        Unordered, so the server may apply the batch in parallel and one duplicate does not
+        stop the rest from being written (the error is still raised afterwards).
+        """
+
+        if questions:
+            self.db.questions.insert_many(_QUESTION_LIST_ADAPTER.dump_python(questions, exclude_none=True), ordered=False)
 
     def update_question(self, question: QuestionResponse) -> None:
-        payload = question.model_dump(exclude={"question_id", "created_at"})
-        payload["options"] = [opt.model_dump() for opt in question.options]
+        payload = self._question_payload(question, exclude={"question_id", "created_at"})
         self.db.questions.update_one({"question_id": question.question_id}, {"$set": payload})
 
     def delete_question(self, question_id: str) -> None:
         self.db.questions.delete_one({"question_id": question_id})
 
     def get_question(self, question_id: str) -> Optional[QuestionResponse]:
-        doc = self.db.questions.find_one({"question_id": question_id})
+        doc = self.db.questions.find_one({"question_id": question_id}, dict(QUESTION_READ_PROJECTION))
         return self._question_from_doc(doc) if doc else None
 
     def list_questions(self) -> List[QuestionResponse]:
-        return [self._question_from_doc(doc) for doc in self.db.questions.find({})]
+        return list(self.iter_questions())
+
+    def iter_questions(self, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[QuestionResponse]:
+        """Yield every question, fetching ``batch_size`` documents per round-trip."""
+
+        for doc in self.db.questions.find({}, dict(QUESTION_READ_PROJECTION)).batch_size(batch_size):
+            yield self._question_from_doc(doc)
 
     def get_questions_by_ids(self, question_ids: List[str]) -> List[QuestionResponse]:
         if not question_ids:
             return []
-        return [self._question_from_doc(doc) for doc in self.db.questions.find({"question_id": {"$in": question_ids}})]
+        cursor = self.db.questions.find({"question_id": {"$in": question_ids}}, dict(QUESTION_READ_PROJECTION))
+        return [self._question_from_doc(doc) for doc in cursor]
 
     def find_questions(
         self,
@@ -257,17 +700,14 @@ class Database:
         sort: Optional[list] = None,
         sample: Optional[int] = None,
     ) -> List[QuestionResponse]:
-        query = {**query, "schema_version": {"$ne": 2}}
+        query = {"$and": [query, LEGACY_QUESTION_FILTER]} if "$or" in query else {**query, **LEGACY_QUESTION_FILTER}
         if sample:
-            total = self.db.questions.count_documents(query)
-            sample_size = min(sample, total) if total else 0
-            if sample_size == 0:
-                return []
-            pipeline = [{"$match": query}, {"$sample": {"size": sample_size}}]
+            # $sample returns every match when fewer than `size` exist, so no count round-trip is needed.
+            pipeline = [{"$match": query}, {"$sample": {"size": sample}}, {"$project": dict(QUESTION_READ_PROJECTION)}]
             cursor = self.db.questions.aggregate(pipeline)
             return [self._question_from_doc(doc) for doc in cursor]
 
-        cursor = self.db.questions.find(query)
+        cursor = self.db.questions.find(query, dict(QUESTION_READ_PROJECTION))
         if sort:
             cursor = cursor.sort(sort)
         if limit:
@@ -283,15 +723,7 @@ class Database:
         """
 
         if doc.get("schema_version") == 2:
-            qtype_raw = doc.get("type")
-            type_map = {
-                "single_choice": QuestionType.MCQ,
-                "multi_choice": QuestionType.MSQ,
-                "integer": QuestionType.NAT,
-                "short_text": QuestionType.NAT,
-                "true_false": QuestionType.MCQ,
-            }
-            qtype = type_map.get(qtype_raw, QuestionType.MCQ)
+            qtype = _V2_TYPE_MAP.get(doc.get("type"), QuestionType.MCQ)
 
             options = [OptionSchema(id=opt["id"], content=opt.get("text", ""), rationale=None) for opt in doc.get("options", [])]
             answer_key = doc.get("answer_key", {}) or {}
@@ -329,14 +761,21 @@ class Database:
                 updated_at=_dt(doc["updated_at"]),
             )
 
-        return QuestionResponse(
+        # Legacy documents are written by insert_question from a validated model, so they
+        # are hydrated directly; schema_version=2 documents come from another writer and
+        # keep full validation above.
+        return self._hydrate(
+            QuestionResponse,
             question_id=doc["question_id"],
-            question_type=doc.get("question_type"),
+            question_type=_QTYPE_BY_VALUE[doc.get("question_type", QuestionType.MCQ)],
             subject_id=doc["subject_id"],
             topic_ids=doc.get("topic_ids", []),
             text=doc["text"],
-            options=[OptionSchema(**opt) for opt in doc.get("options", [])],
-            correct_option_id=doc["correct_option_id"],
+            options=[
+                self._hydrate(OptionSchema, id=opt["id"], content=opt["content"], rationale=opt.get("rationale"))
+                for opt in doc.get("options", [])
+            ],
+            correct_option_id=doc.get("correct_option_id"),
             correct_option_ids=doc.get("correct_option_ids"),
             answer_value=doc.get("answer_value"),
             difficulty=int(doc["difficulty"]),
@@ -347,24 +786,13 @@ class Database:
             metadata=doc.get("metadata"),
             solution=doc.get("solution"),
             is_active=bool(doc.get("is_active", True)),
-            created_at=_dt(doc["created_at"]),
-            updated_at=_dt(doc["updated_at"]),
+            created_at=doc["created_at"],
+            updated_at=doc["updated_at"],
         )
 
     # Test series methods
     def insert_test_series(self, series: TestSeriesResponse) -> None:
-        payload = series.model_dump()
-        if series.syllabus_coverage:
-            payload["syllabus_coverage"] = [item.model_dump() for item in series.syllabus_coverage]
-        if series.stats:
-            payload["stats"] = series.stats.model_dump()
-        if series.access:
-            payload["access"] = series.access.model_dump()
-        if series.availability:
-            payload["availability"] = series.availability.model_dump()
-        if series.counters:
-            payload["counters"] = series.counters.model_dump()
-        self.db.test_series.insert_one(payload)
+        self.db.test_series.insert_one(self._serialize(series))
 
     def update_test_series(self, series: TestSeriesResponse) -> None:
         payload = series.model_dump(exclude={"series_id", "created_at"})
@@ -411,7 +839,8 @@ class Database:
         sort_by: str = "display_order",
         sort_order: str = "asc",
         include_total: bool = False,
-    ) -> tuple[List[TestSeriesResponse], int]:
+        cursor: Optional[Cursor] = None,
+    ) -> tuple[List[TestSeriesResponse], Optional[int]]:
         query: dict = {}
         if exam_id:
             query["exam_id"] = exam_id
@@ -432,24 +861,13 @@ class Database:
         if language_code:
             query["language_codes"] = language_code
 
-        sort_fields = {
-            "display_order": "display_order",
-            "created_at": "created_at",
-            "updated_at": "updated_at",
-            "name": "name",
-            "published_at": "published_at",
-        }
-        sort_field = sort_fields.get(sort_by, "display_order")
+        sort_field = resolve_sort_field(sort_by, TEST_SERIES_SORT_FIELDS)
         sort_dir = ASCENDING if sort_order.lower() != "desc" else DESCENDING
 
-        total = self.db.test_series.count_documents(query) if include_total else 0
-        cursor = (
-            self.db.test_series.find(query)
-            .skip(max(0, skip))
-            .limit(limit)
-            .sort([(sort_field, sort_dir)])
+        docs, total = self._page_with_total(
+            self.db.test_series, query, None, sort_field, sort_dir, "series_id", skip, limit, cursor, include_total
         )
-        return [self._series_from_doc(doc) for doc in cursor], total
+        return [self._series_from_doc(doc) for doc in docs], total
 
     def _series_from_doc(self, doc: dict) -> TestSeriesResponse:
         syllabus_coverage = [SyllabusCoverageItem(**item) for item in doc.get("syllabus_coverage", [])]
@@ -474,50 +892,69 @@ class Database:
             syllabus_coverage=syllabus_coverage,
             status=doc.get("status", "draft"),
             is_active=bool(doc.get("is_active", True)),
-            available_from=_dt(doc["available_from"]) if doc.get("available_from") else None,
-            available_until=_dt(doc["available_until"]) if doc.get("available_until") else None,
+            available_from=doc.get("available_from"),
+            available_until=doc.get("available_until"),
             availability=availability,
             tags=doc.get("tags", []),
             language=doc.get("language"),
             language_codes=doc.get("language_codes", []),
-            new_until=_dt(doc["new_until"]) if doc.get("new_until") else None,
-            published_at=_dt(doc["published_at"]) if doc.get("published_at") else None,
-            archived_at=_dt(doc["archived_at"]) if doc.get("archived_at") else None,
+            new_until=doc.get("new_until"),
+            published_at=doc.get("published_at"),
+            archived_at=doc.get("archived_at"),
             access=access,
             counters=counters,
             version=doc.get("version"),
             display_order=int(doc.get("display_order", 0)),
             stats=stats,
             metadata=doc.get("metadata"),
-            created_at=_dt(doc["created_at"]),
-            updated_at=_dt(doc["updated_at"]),
+            created_at=doc["created_at"],
+            updated_at=doc["updated_at"],
         )
 
     # Test methods
-    def insert_test(self, test: TestResponse) -> None:
-        payload = test.model_dump()
-        payload["questions"] = [q.model_dump() for q in test.questions]
-        payload["pattern"]["sections"] = [
-            {
-                **section.model_dump(),
-                "marking_scheme": {k.value if hasattr(k, "value") else str(k): v.model_dump() for k, v in section.marking_scheme.items()},
+    @staticmethod
+    def _test_payload(
+        test: TestResponse, exclude: Optional[set] = None, include: Optional[set] = None, exclude_none: bool = False
+    ) -> dict:
+        """Dump a test in one recursive pass; only marking_scheme's enum keys need converting for BSON."""
+
+        payload = test.model_dump(exclude=exclude, include=include, exclude_none=exclude_none)
+        for section in payload["pattern"]["sections"] if payload.get("pattern") else ():
+            section["marking_scheme"] = {
+                k.value if hasattr(k, "value") else str(k): v for k, v in section["marking_scheme"].items()
             }
-            for section in test.pattern.sections
-        ]
+        return payload
+
+    def insert_test(self, test: TestResponse) -> None:
+        payload = self._test_payload(test, exclude_none=True)
         self.db.tests.insert_one(payload)
 
     def update_test(self, test: TestResponse) -> None:
-        payload = test.model_dump(exclude={"test_id", "created_at"})
-        payload["questions"] = [q.model_dump() for q in test.questions]
-        payload["pattern"]["sections"] = [
-            {
-                **section.model_dump(),
-                "marking_scheme": {k.value if hasattr(k, "value") else str(k): v.model_dump() for k, v in section.marking_scheme.items()},
-            }
-            for section in test.pattern.sections
-        ]
+        payload = self._test_payload(test, exclude={"test_id", "created_at"})
         self.db.tests.update_one({"test_id": test.test_id}, {"$set": payload})
 
+    def update_test_fields(self, test: TestResponse, fields: Iterable[str]) -> None:
+        """
+        $set only the named top-level ``fields`` of ``test`` (updated_at always included).
+
+        Cheaper than update_test for small edits: untouched fields such as the questions array
+        are neither re-sent nor re-indexed.
+        """
+
+        include = {*fields, "updated_at"}
+        unknown = include - TEST_MUTABLE_FIELDS
+        if unknown:
+            raise ValueError(f"Fields cannot be updated on a test: {sorted(unknown)}")
+        payload = self._test_payload(test, include=include)
+        self.db.tests.update_one({"test_id": test.test_id}, {"$set": payload})
+
+    def update_test_question(self, test_id: str, question_id: str, fields: Dict[str, Any], updated_at: datetime) -> None:
+        """$set fields on one question reference in place via the positional operator."""
+
+        update = {f"questions.$.{name}": value for name, value in fields.items()}
+        update["updated_at"] = updated_at
+        self.db.tests.update_one({"test_id": test_id, "questions.question_id": question_id}, {"$set": update})
+
     def delete_test(self, test_id: str) -> None:
         self.db.tests.delete_one({"test_id": test_id})
 
@@ -544,7 +981,8 @@ class Database:
         sort_by: str = "test_number",
         sort_order: str = "asc",
         include_total: bool = False,
-    ) -> tuple[List[TestResponse], int]:
+        cursor: Optional[Cursor] = None,
+    ) -> tuple[List[TestResponse], Optional[int]]:
         query: dict = {}
         if series_id:
             query["series_id"] = series_id
@@ -553,22 +991,27 @@ class Database:
         if is_active is not None:
             query["is_active"] = is_active
         projection = None if include_questions else {"questions": 0}
-        sort_fields = {
-            "test_number": "test_number",
-            "created_at": "created_at",
-            "updated_at": "updated_at",
-            "name": "name",
-        }
-        sort_field = sort_fields.get(sort_by, "test_number")
+        sort_field = resolve_sort_field(sort_by, TEST_SORT_FIELDS)
         sort_dir = ASCENDING if sort_order.lower() != "desc" else DESCENDING
-        total = self.db.tests.count_documents(query) if include_total else 0
-        cursor = (
-            self.db.tests.find(query, projection)
-            .skip(max(0, skip))
-            .limit(limit)
-            .sort([(sort_field, sort_dir)])
+        docs, total = self._page_with_total(
+            self.db.tests, query, projection, sort_field, sort_dir, "test_id", skip, limit, cursor, include_total
         )
-        return [self._test_from_doc(doc, include_questions=include_questions) for doc in cursor], total
+        return [self._test_from_doc(doc, include_questions=include_questions) for doc in docs], total
+
+    def find_test_conflicts(
+        self, code: str, slug: str, series_id: Optional[str] = None, test_number: Optional[int] = None
+    ) -> List[dict]:
+        """
+        Tests sharing ``code``, ``slug`` or (``series_id``, ``test_number``), in one query.
+
+        Only the identifying fields are returned; callers decide which uniqueness rule was hit.
+        """
+
+        clauses: List[dict] = [{"code": code}, {"slug": slug}]
+        if series_id and test_number is not None:
+            clauses.append({"series_id": series_id, "test_number": test_number})
+        projection = {"_id": 0, "code": 1, "slug": 1, "series_id": 1, "test_number": 1}
+        return list(self.db.tests.find({"$or": clauses}, projection))
 
     def get_test_by_series_and_number(self, series_id: str, test_number: int) -> Optional[TestResponse]:
         doc = self.db.tests.find_one({"series_id": series_id, "test_number": test_number})
@@ -578,15 +1021,25 @@ class Database:
         return self.db.tests.count_documents({"series_id": series_id})
 
     def aggregate_series_stats(self, series_id: str) -> dict:
+        # Reduce each test to a few scalars before grouping, so the heavy questions array never
+        # travels past the first stage. The $match is served by the series_id-prefixed indexes.
         pipeline = [
             {"$match": {"series_id": series_id}},
+            {
+                "$project": {
+                    "series_id": 1,
+                    "qsize": {"$size": {"$ifNull": ["$questions", []]}},
+                    "qdiff": {"$avg": "$questions.difficulty"},
+                    "dur": "$pattern.total_duration_minutes",
+                }
+            },
             {
                 "$group": {
                     "_id": "$series_id",
                     "total_tests": {"$sum": 1},
-                    "total_questions": {"$sum": {"$size": {"$ifNull": ["$questions", []]}}},
-                    "total_duration_minutes": {"$sum": "$pattern.total_duration_minutes"},
-                    "avg_difficulty": {"$avg": {"$avg": "$questions.difficulty"}},
+                    "total_questions": {"$sum": "$qsize"},
+                    "total_duration_minutes": {"$sum": "$dur"},
+                    "avg_difficulty": {"$avg": "$qdiff"},
                 }
             },
         ]
@@ -599,10 +1052,11 @@ class Database:
             marking_raw = section.get("marking_scheme", {}) or {}
             marking: Dict[QuestionType, SectionMarkingScheme] = {}
             for key, value in marking_raw.items():
-                qtype = QuestionType(key)
-                marking[qtype] = SectionMarkingScheme(**value) if isinstance(value, dict) else value
+                qtype = _QTYPE_BY_VALUE[key]
+                marking[qtype] = self._hydrate(SectionMarkingScheme, **value) if isinstance(value, dict) else value
             sections.append(
-                TestSection(
+                self._hydrate(
+                    TestSection,
                     section_id=section["section_id"],
                     section_code=section["section_code"],
                     name=section["name"],
@@ -617,7 +1071,8 @@ class Database:
                 )
             )
 
-        pattern = TestPattern(
+        pattern = self._hydrate(
+            TestPattern,
             total_duration_minutes=doc["pattern"].get("total_duration_minutes"),
             total_marks=doc["pattern"].get("total_marks"),
             total_questions=doc["pattern"].get("total_questions"),
@@ -627,11 +1082,12 @@ class Database:
         if include_questions:
             for q in doc.get("questions", []):
                 questions.append(
-                    QuestionReference(
+                    self._hydrate(
+                        QuestionReference,
                         seq=int(q["seq"]),
                         section_id=q["section_id"],
                         question_id=q["question_id"],
-                        question_type=QuestionType(q["question_type"]),
+                        question_type=_QTYPE_BY_VALUE[q["question_type"]],
                         subject_id=q["subject_id"],
                         topic_ids=q.get("topic_ids", []),
                         difficulty=int(q["difficulty"]),
@@ -642,7 +1098,17 @@ class Database:
                     )
                 )
 
-        return TestResponse(
+        # Settings, solutions and availability appear on every listed test; hydrate them like the
+        # rest of the document instead of re-validating each flag.
+        solutions = dict(doc.get("solutions") or {})
+        if "release_mode" in solutions:
+            solutions["release_mode"] = ReleaseMode(solutions["release_mode"])
+        availability = dict(doc.get("availability") or {})
+        if "mode" in availability:
+            availability["mode"] = AvailabilityMode(availability["mode"])
+
+        return self._hydrate(
+            TestResponse,
             test_id=doc["test_id"],
             code=doc["code"],
             slug=doc["slug"],
@@ -651,26 +1117,23 @@ class Database:
             name=doc["name"],
             description=doc.get("description"),
             pattern=pattern,
-            settings=doc.get("settings", {}),
-            solutions=doc.get("solutions", {}),
-            availability=doc.get("availability", {}),
+            settings=self._hydrate(TestSettings, **(doc.get("settings") or {})),
+            solutions=self._hydrate(SolutionsConfig, **solutions),
+            availability=self._hydrate(Availability, **availability),
             is_active=bool(doc.get("is_active", True)),
-            status=doc.get("status", "draft"),
+            status=TestStatus(doc.get("status", TestStatus.draft)),
             tags=doc.get("tags", []),
             version=doc.get("version"),
             language=doc.get("language"),
             metadata=doc.get("metadata"),
             questions=questions,
-            created_at=_dt(doc["created_at"]),
-            updated_at=_dt(doc["updated_at"]),
+            created_at=doc["created_at"],
+            updated_at=doc["updated_at"],
         )
 
     # Test instructions methods
     def upsert_test_instructions(self, doc: TestInstructionsResponse) -> None:
-        payload = doc.model_dump()
-        payload["sections"] = [section.model_dump() for section in doc.sections]
-        if doc.proctoring:
-            payload["proctoring"] = doc.proctoring.model_dump()
+        payload = self._serialize(doc)
         self.db.test_instructions.replace_one({"test_id": doc.test_id}, payload, upsert=True)
 
     def get_test_instructions(self, test_id: str) -> Optional[TestInstructionsResponse]:
@@ -690,8 +1153,8 @@ class Database:
             sections=sections,
             proctoring=proctoring,
             metadata=doc.get("metadata"),
-            created_at=_dt(doc["created_at"]),
-            updated_at=_dt(doc["updated_at"]),
+            created_at=doc["created_at"],
+            updated_at=doc["updated_at"],
         )
 
     # Maintenance helpers
@@ -700,24 +1163,55 @@ class Database:
         self.db.exams.delete_many({})
         self.db.topics.delete_many({})
         self.db.subjects.delete_many({})
+        self._masters.invalidate()
 
 
-db_instance = Database()
+_db: Optional[Database] = None
+_db_lock = threading.Lock()
 
 
 def get_db() -> Database:
-    """Return the singleton database repository."""
+    """Return the singleton database repository, connecting on first use."""
+
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                _db = Database()
+    return _db
+
+
+async def provide_db() -> AsyncIterator[Database]:
+    """
+    FastAPI dependency yielding the shared repository.
+
+    Declared async so resolving it does not cost a threadpool hop per request;
+    blocking repository calls are offloaded by the endpoints themselves.
+    """
+
+    yield get_db()
 
-    return db_instance
+
+def close_db() -> None:
+    """Release the shared client's pooled connections (application shutdown)."""
+
+    global _db
+    with _db_lock:
+        if _db is not None:
+            _db.close()
+            # A closed client cannot be reused; the next get_db() connects afresh.
+            _db = None
 
 
 def init_db() -> None:
     """Seed the database with initial masters, exam, and questions."""
 
     db = get_db()
+    db.ensure_indexes()
+    if not get_settings().seed_demo_data:
+        return
     # Safety: do not wipe existing data; seed only if empty.
-    subjects, _ = db.list_subjects()
-    if subjects:
+    if db.has_subjects():
         return
 
     now = datetime.utcnow()
@@ -733,7 +1227,11 @@ def init_db() -> None:
         created_at=now,
         updated_at=now,
     )
-    db.insert_subject(physics)
+    try:
+        db.insert_subject(physics)
+    except DuplicateKeyError:
+        # Another worker found the database empty at the same moment and is seeding it.
+        return
 
     thermodynamics = TopicResponse(
         id="topic_thermodynamics",
@@ -794,7 +1292,6 @@ def init_db() -> None:
         created_at=now,
         updated_at=now,
     )
-    db.insert_question(q1)
 
     q2_options = [
         OptionSchema(id="optA", content="Temperature remains constant"),
@@ -821,4 +1318,4 @@ def init_db() -> None:
         created_at=now,
         updated_at=now,
     )
-    db.insert_question(q2)
+    db.insert_questions([q1, q2])
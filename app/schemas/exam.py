@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, SkipValidation
 
 
 class ExamSyllabusItem(BaseModel):
@@ -12,6 +12,7 @@ class ExamSyllabusItem(BaseModel):
     weight: Optional[float] = Field(
         default=None, ge=0, le=1, description="Optional weight to prioritize the subject within the exam"
     )
+    model_config = ConfigDict(frozen=True)
 
 
 class ExamBase(BaseModel):
@@ -51,3 +52,5 @@ class ExamResponse(ExamBase):
     created_at: datetime
     updated_at: datetime
     created_by: Optional[str] = None
+    metadata: SkipValidation[Optional[Dict[str, Any]]] = None
+    model_config = ConfigDict(frozen=True, extra="ignore")
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, SkipValidation
 
 
 class SubjectBase(BaseModel):
@@ -38,15 +38,19 @@ class SubjectResponse(SubjectBase):
     id: str
     created_at: datetime
     updated_at: datetime
+    # Checked when the create/update payload was validated; the stored dict is passed through as is.
+    metadata: SkipValidation[Optional[Dict[str, Any]]] = None
+    model_config = ConfigDict(frozen=True, extra="ignore")
 
 
 class PaginatedSubjects(BaseModel):
     """Envelope for paginated subject listings."""
 
     items: List[SubjectResponse]
-    total: int
+    total: Optional[int] = Field(default=None, description="Count of all matches; reported on the first page only")
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 
 class TopicBase(BaseModel):
@@ -95,6 +99,8 @@ class TopicResponse(TopicBase):
     id: str
     created_at: datetime
     updated_at: datetime
+    metadata: SkipValidation[Optional[Dict[str, Any]]] = None
+    model_config = ConfigDict(frozen=True, extra="ignore")
 
 
 class TopicUpdateLinks(BaseModel):
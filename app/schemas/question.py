@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, SkipValidation
 
 
 class OptionSchema(BaseModel):
@@ -11,6 +11,7 @@ class OptionSchema(BaseModel):
     id: str
     content: str
     rationale: Optional[str] = None
+    model_config = ConfigDict(frozen=True)
 
 
 class QuestionType(str, Enum):
@@ -71,3 +72,6 @@ class QuestionResponse(QuestionBase):
     question_id: str
     created_at: datetime
     updated_at: datetime
+    # Checked when the create/update payload was validated; the stored dict is passed through as is.
+    metadata: SkipValidation[Optional[Dict[str, Any]]] = None
+    model_config = ConfigDict(frozen=True, extra="ignore")
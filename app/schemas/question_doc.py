@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 
@@ -13,6 +13,10 @@ class QuestionDocType(str, Enum):
     true_false = "true_false"
 
 
+_CHOICE_TYPES = frozenset({QuestionDocType.single_choice, QuestionDocType.multi_choice, QuestionDocType.true_false})
+_VALUE_TYPES = frozenset({QuestionDocType.integer, QuestionDocType.short_text})
+
+
 class AnswerKeyType(str, Enum):
     single = "single"
     multi = "multi"
@@ -22,6 +26,7 @@ class AnswerKeyType(str, Enum):
 class OptionDoc(BaseModel):
     id: str = Field(..., min_length=1)
     text: str = Field(..., min_length=1)
+    model_config = ConfigDict(frozen=True)
 
 
 class AnswerKey(BaseModel):
@@ -29,6 +34,7 @@ class AnswerKey(BaseModel):
     option_id: Optional[str] = None
     option_ids: Optional[List[str]] = None
     value: Optional[str] = None
+    model_config = ConfigDict(frozen=True)
 
 
 class SolutionDoc(BaseModel):
@@ -80,37 +86,37 @@ class QuestionDocBase(BaseModel):
 
     @model_validator(mode="after")
     def validate_type_specific(self) -> "QuestionDocBase":
+        answer_key = self.answer_key
         # If answer_key is missing (e.g., projected out in a public view), skip validation.
-        if self.answer_key is None:
+        if answer_key is None:
             return self
 
         qtype = self.type
-        options = self.options or []
-        opt_ids = {opt.id for opt in options}
+        options = self.options
 
-        if qtype in (QuestionDocType.single_choice, QuestionDocType.multi_choice, QuestionDocType.true_false):
+        if qtype in _CHOICE_TYPES:
             if not options and qtype != QuestionDocType.true_false:
                 raise ValueError("options are required for choice questions")
-            if self.answer_key.type == AnswerKeyType.single:
-                if not self.answer_key.option_id:
+            if answer_key.type == AnswerKeyType.single:
+                if not answer_key.option_id:
                     raise ValueError("answer_key.option_id is required for single answer")
-                if opt_ids and self.answer_key.option_id not in opt_ids:
+                if options and not any(opt.id == answer_key.option_id for opt in options):
                     raise ValueError("answer_key.option_id must exist in options")
-            elif self.answer_key.type == AnswerKeyType.multi:
-                if not self.answer_key.option_ids:
+            elif answer_key.type == AnswerKeyType.multi:
+                if not answer_key.option_ids:
                     raise ValueError("answer_key.option_ids is required for multi answer")
-                missing = [oid for oid in self.answer_key.option_ids if oid not in opt_ids]
+                opt_ids = {opt.id for opt in options}
+                missing = [oid for oid in answer_key.option_ids if oid not in opt_ids]
                 if missing:
                     raise ValueError(f"answer_key.option_ids missing in options: {missing}")
             else:
                 raise ValueError("choice questions must use answer_key.type=single|multi")
-
-        if qtype in (QuestionDocType.integer, QuestionDocType.short_text):
+        elif qtype in _VALUE_TYPES:
             if options:
                 raise ValueError("options must be empty for value questions")
-            if self.answer_key.type != AnswerKeyType.value:
+            if answer_key.type != AnswerKeyType.value:
                 raise ValueError("value questions require answer_key.type=value")
-            if not self.answer_key.value:
+            if not answer_key.value:
                 raise ValueError("answer_key.value is required for value questions")
 
         return self
@@ -142,49 +148,46 @@ class QuestionDocResponse(QuestionDocBase):
     search_blob: Optional[str] = None
     created_at: datetime
     updated_at: datetime
-    rand_key: Optional[float] = None
+    rand_key: Optional[Union[int, float]] = None
     schema_version: Optional[int] = None
-    model_config = ConfigDict(extra="ignore")
-
-
-class QuestionPublicView(QuestionDocResponse):
-    model_config = ConfigDict(
-        fields={
-            "answer_key": {"exclude": True},
-            "solution": {"exclude": True},
-            "search_blob": {"exclude": True},
-            "rand_key": {"exclude": True},
-            "schema_version": {"exclude": True},
-        },
-        extra="ignore",
-    )
-
-
-class QuestionPreviewView(QuestionDocResponse):
-    model_config = ConfigDict(
-        fields={
-            "solution": {"exclude": True},
-            "search_blob": {"exclude": True},
-            "rand_key": {"exclude": True},
-            "schema_version": {"exclude": True},
-        },
-        extra="ignore",
-    )
-
-
-class QuestionFullView(QuestionDocResponse):
-    model_config = ConfigDict(
-        fields={
-            "search_blob": {"exclude": True},
-            "rand_key": {"exclude": True},
-            "schema_version": {"exclude": True},
-        },
-        extra="ignore",
-    )
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+
+class QuestionPublicView(BaseModel):
+    """
+    Student-facing projection of a question document.
+
+    The views declare only the fields they return rather than inheriting QuestionDocResponse, so
+    listing pages never validate or hold answer keys, solutions or the internal search/sampling fields.
+    """
+
+    text: str
+    type: QuestionDocType
+    options: List[OptionDoc] = Field(default_factory=list)
+    taxonomy: TaxonomyDoc
+    difficulty: int
+    tags: List[str] = Field(default_factory=list)
+    language: str = "en"
+    usage: UsageDoc = Field(default_factory=UsageDoc)
+    meta: MetaDoc = Field(default_factory=MetaDoc)
+    question_id: str
+    version: int
+    created_at: datetime
+    updated_at: datetime
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+
+class QuestionPreviewView(QuestionPublicView):
+    answer_key: Optional[AnswerKey] = None
+
+
+class QuestionFullView(QuestionPreviewView):
+    solution: Optional[SolutionDoc] = None
 
 
 class PaginatedQuestions(BaseModel):
     items: List[QuestionPublicView]
-    total: int
+    total: Optional[int] = Field(default=None, description="Count of all matches; reported on the first page only")
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
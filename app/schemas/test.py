@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, constr
+from pydantic import BaseModel, ConfigDict, Field, SkipValidation
 
 from app.schemas.question import QuestionType
 from app.schemas.test_series import SlugStr
@@ -34,6 +34,7 @@ class SectionMarkingScheme(BaseModel):
     incorrect: float = 0.0
     unattempted: float = 0.0
     partial: Optional[float] = None
+    model_config = ConfigDict(frozen=True)
 
 
 class TestSection(BaseModel):
@@ -75,6 +76,7 @@ class QuestionReference(BaseModel):
     negative_marks: Optional[float] = None
     is_bonus: bool = False
     is_optional: bool = False
+    model_config = ConfigDict(frozen=True)
 
 
 class AddQuestionsRequest(BaseModel):
@@ -211,15 +213,18 @@ class TestResponse(TestBase):
     questions: List[QuestionReference] = Field(default_factory=list)
     created_at: datetime
     updated_at: datetime
+    metadata: SkipValidation[Optional[Dict[str, Any]]] = None
+    model_config = ConfigDict(frozen=True, extra="ignore")
 
 
 class PaginatedTests(BaseModel):
     """Envelope for paginated test listings."""
 
     items: List[TestResponse]
-    total: int
+    total: Optional[int] = Field(default=None, description="Count of all matches; reported on the first page only")
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 
 class ValidationResult(BaseModel):
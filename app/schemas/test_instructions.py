@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, SkipValidation
 
 
 class InstructionBlock(BaseModel):
@@ -48,3 +48,5 @@ class TestInstructionsResponse(TestInstructionsBase):
     test_id: str
     created_at: datetime
     updated_at: datetime
+    metadata: SkipValidation[Optional[Dict[str, Any]]] = None
+    model_config = ConfigDict(frozen=True, extra="ignore")
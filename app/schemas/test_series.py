@@ -1,11 +1,12 @@
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Annotated, Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, constr
+from pydantic import BaseModel, ConfigDict, Field, SkipValidation, StringConstraints
 
 
-SlugStr = constr(pattern=r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
+# One shared alias (also used by app.schemas.test) so every slug field carries the identical constraint.
+SlugStr = Annotated[str, StringConstraints(pattern=r"^[a-z0-9]+(?:-[a-z0-9]+)*$")]
 
 
 class SeriesStatus(str, Enum):
@@ -155,12 +156,15 @@ class TestSeriesResponse(TestSeriesBase):
     series_id: str
     created_at: datetime
     updated_at: datetime
+    metadata: SkipValidation[Optional[Dict[str, Any]]] = None
+    model_config = ConfigDict(frozen=True, extra="ignore")
 
 
 class PaginatedTestSeries(BaseModel):
     """Envelope for paginated test series listings."""
 
     items: List[TestSeriesResponse]
-    total: int
+    total: Optional[int] = Field(default=None, description="Count of all matches; reported on the first page only")
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
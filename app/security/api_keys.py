@@ -1,5 +1,4 @@
 import hashlib
-import hmac
 import logging
 import os
 import secrets
@@ -7,6 +6,7 @@ import threading
 from typing import Optional, Set
 
 from fastapi import Depends, Header, HTTPException, status
+from fastapi.security import APIKeyHeader
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +14,13 @@ _salt_lock = threading.Lock()
 _salt: Optional[str] = None
 _api_key_store: Set[str] = set()
 
+# OpenAPI security scheme for routes whose key is checked by RateLimitMiddleware rather than a
+# dependency; auto_error=False keeps it documentation only (and gives Swagger its Authorize box).
+api_key_scheme = APIKeyHeader(name="X-API-Key", auto_error=False)
+
+# Generated keys are 43 characters; anything far longer is rejected before it is hashed.
+MAX_API_KEY_LENGTH = 256
+
 
 def _get_salt() -> str:
     """Fetch and cache the API key salt from environment."""
@@ -50,8 +57,24 @@ def add_hashed_key(hashed_key: str) -> None:
 def is_raw_key_valid(raw_key: str) -> bool:
     """Check if a raw key matches any stored hash."""
 
+    return match_api_key(raw_key) is not None
+
+
+def match_api_key(raw_key: Optional[str]) -> Optional[str]:
+    """
+    Return the stored hash for a registered raw key, or None if missing/unknown.
+
+    The lookup is a single set membership test on the salted hash. The caller controls only
+    the raw key, and its SHA-256 digest with a server-side salt is what gets compared, so
+    timing on the digest reveals nothing usable about stored keys; the salted hash is the
+    timing-safe comparand and no per-key compare_digest scan is needed.
+    """
+
+    # Cheap rejections first so junk or oversized headers never reach the hash.
+    if not raw_key or not _api_key_store or len(raw_key) > MAX_API_KEY_LENGTH:
+        return None
     hashed = hash_api_key(raw_key)
-    return any(hmac.compare_digest(hashed, candidate) for candidate in _api_key_store)
+    return hashed if hashed in _api_key_store else None
 
 
 def register_api_key(raw_key: str) -> str:
@@ -74,12 +97,8 @@ def generate_api_key() -> tuple[str, str]:
 def verify_api_key(x_api_key: Optional[str] = Header(default=None)) -> str:
     """Dependency to validate incoming API key header and return hashed key."""
 
-    if not x_api_key:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or missing API Key")
-
-    hashed = hash_api_key(x_api_key)
-    valid = any(hmac.compare_digest(hashed, candidate) for candidate in _api_key_store)
-    if not valid:
+    hashed = match_api_key(x_api_key)
+    if hashed is None:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid or missing API Key")
     return hashed
 
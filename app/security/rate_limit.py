@@ -1,31 +1,173 @@
+import logging
 import threading
 import time
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from redis import Redis
+from redis.exceptions import RedisError
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-from app.security.api_keys import verify_api_key
+from app.db.redis_client import get_redis
+from app.security.api_keys import match_api_key, verify_api_key
+
+logger = logging.getLogger(__name__)
+
+# In-process counters are split across this many lock/table pairs (a power of two, so a mask picks
+# the shard) so requests for unrelated API keys never wait on each other's lock.
+_LOCAL_SHARDS = 64
+
+# Atomically weigh the previous window against the current one and count the request if allowed.
+_SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local weight = tonumber(ARGV[2])
+local ttl = tonumber(ARGV[3])
+local counts = redis.call('MGET', KEYS[1], KEYS[2])
+local current = tonumber(counts[1]) or 0
+local previous = tonumber(counts[2]) or 0
+if current + previous * weight >= limit then
+  return 0
+end
+redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ttl)
+return 1
+"""
 
 
 class RateLimiter:
-    """In-memory sliding window rate limiter keyed by hashed API key."""
+    """
+    Sliding-window-counter rate limiter keyed by hashed API key.
 
-    def __init__(self, limit: int = 60, window_seconds: int = 60) -> None:
+    Requests are counted per fixed window; the effective count is the current window
+    plus the previous one weighted by how much of it still overlaps the sliding window,
+    which avoids the 2x burst a plain fixed window allows at its boundary. Counters live
+    in Redis when MQDB_REDIS_URL is set so all workers share one budget; otherwise (or if
+    Redis is unreachable) they are kept in process memory.
+    """
+
+    def __init__(self, limit: int = 60, window_seconds: int = 60, redis_client: Optional[Redis] = None) -> None:
         self.limit = limit
         self.window = window_seconds
-        self._lock = threading.Lock()
-        self._requests: Dict[str, List[float]] = {}
+        self._redis = redis_client
+        self._redis_resolved = redis_client is not None
+        self._script = None
+        # Each shard maps key -> [window index, current count, previous count] under its own lock.
+        self._shards: Tuple[Tuple[threading.Lock, Dict[str, List[int]]], ...] = tuple(
+            (threading.Lock(), {}) for _ in range(_LOCAL_SHARDS)
+        )
 
     def __call__(self, hashed_api_key: str = Depends(verify_api_key)) -> None:
-        now = time.time()
-        window_start = now - self.window
-        with self._lock:
-            timestamps = self._requests.get(hashed_api_key, [])
-            timestamps = [ts for ts in timestamps if ts >= window_start]
-            if len(timestamps) >= self.limit:
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail=f"Rate limit exceeded ({self.limit} requests/{self.window}s)",
-                )
-            timestamps.append(now)
-            self._requests[hashed_api_key] = timestamps
+        if not self.acquire(hashed_api_key):
+            raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=self.exceeded_detail)
+
+    @property
+    def exceeded_detail(self) -> str:
+        return f"Rate limit exceeded ({self.limit} requests/{self.window}s)"
+
+    @property
+    def shared(self) -> bool:
+        """True when counters live in Redis (acquiring then blocks on the network)."""
+
+        return self._get_redis() is not None
+
+    def acquire(self, key: str) -> bool:
+        """Count one request for ``key``; False if it would exceed the limit (nothing is counted then)."""
+
+        window_index, weight = self._window_position(time.time())
+        client = self._get_redis()
+        if client is not None:
+            try:
+                return self._acquire_redis(client, key, window_index, weight)
+            except RedisError as exc:
+                logger.warning("Redis rate limiting unavailable, using in-process counters: %s", exc)
+        return self._acquire_local(key, window_index, weight)
+
+    def _window_position(self, now: float) -> Tuple[int, float]:
+        """Return the current window index and the weight still carried by the previous window."""
+
+        window_index = int(now // self.window)
+        elapsed_fraction = (now - window_index * self.window) / self.window
+        return window_index, 1.0 - elapsed_fraction
+
+    def _get_redis(self) -> Optional[Redis]:
+        if not self._redis_resolved:
+            self._redis = get_redis()
+            self._redis_resolved = True
+        return self._redis
+
+    def _acquire_redis(self, client: Redis, key: str, window_index: int, weight: float) -> bool:
+        if self._script is None:
+            # register_script issues EVALSHA and only re-sends the body on NOSCRIPT.
+            self._script = client.register_script(_SLIDING_WINDOW_LUA)
+        prefix = f"rl:{self.limit}:{self.window}:{key}"
+        allowed = self._script(
+            keys=[f"{prefix}:{window_index}", f"{prefix}:{window_index - 1}"],
+            args=[self.limit, weight, self.window * 2],
+        )
+        return bool(allowed)
+
+    def _acquire_local(self, key: str, window_index: int, weight: float) -> bool:
+        lock, counters = self._shards[hash(key) & (_LOCAL_SHARDS - 1)]
+        with lock:
+            counter = counters.get(key)
+            if counter is None:
+                counter = counters[key] = [window_index, 0, 0]
+            elif counter[0] != window_index:
+                # Roll forward; anything older than the previous window no longer counts.
+                counter[2] = counter[1] if counter[0] == window_index - 1 else 0
+                counter[1] = 0
+                counter[0] = window_index
+            if counter[1] + counter[2] * weight >= self.limit:
+                return False
+            counter[1] += 1
+            return True
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing X-API-Key auth plus one RateLimiter for every route under ``prefix``.
+
+    Replaces attaching the limiter as a dependency on each router: requests are checked
+    once before routing. Paths under ``exempt`` (relative to the prefix) pass through
+    untouched so they can apply their own guards/limiters.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter, prefix: str, exempt: Sequence[str] = ()) -> None:
+        self.app = app
+        self.limiter = limiter
+        self.prefix = prefix.rstrip("/") + "/"
+        self.exempt = tuple(self.prefix + path.lstrip("/") for path in exempt)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or not scope["path"].startswith(self.prefix)
+            or scope["path"].startswith(self.exempt)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        raw_key = None
+        for name, value in scope["headers"]:
+            if name == b"x-api-key":
+                raw_key = value.decode("latin-1")
+                break
+        hashed = match_api_key(raw_key)
+        if hashed is None:
+            response = JSONResponse({"detail": "Invalid or missing API Key"}, status_code=status.HTTP_403_FORBIDDEN)
+            await response(scope, receive, send)
+            return
+
+        if self.limiter.shared:
+            allowed = await run_in_threadpool(self.limiter.acquire, hashed)
+        else:
+            allowed = self.limiter.acquire(hashed)
+        if not allowed:
+            response = JSONResponse({"detail": self.limiter.exceeded_detail}, status_code=status.HTTP_429_TOO_MANY_REQUESTS)
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
@@ -11,14 +11,16 @@ from app.schemas.exam import ExamCreate, ExamResponse, ExamSyllabusItem, ExamUpd
 def _validate_syllabus(syllabus: List[ExamSyllabusItem], db: Database) -> None:
     """Validate that subjects and topics exist and topics belong to the listed subject."""
 
+    subjects = db.get_subjects_by_ids(item.subject_id for item in syllabus)
+    topics = db.get_topics_by_ids(topic_id for item in syllabus for topic_id in item.topic_ids)
     for item in syllabus:
-        if not db.get_subject(item.subject_id):
+        if item.subject_id not in subjects:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Subject {item.subject_id} does not exist",
             )
         for topic_id in item.topic_ids:
-            topic = db.get_topic(topic_id)
+            topic = topics.get(topic_id)
             if not topic:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -89,8 +91,7 @@ def update_exam(exam_id: str, payload: ExamUpdate, db: Optional[Database] = None
     if payload.syllabus is not None:
         _validate_syllabus(payload.syllabus, db)
 
-    updated = exam.copy(update={k: v for k, v in payload.dict(exclude_unset=True).items()})
-    updated.updated_at = datetime.utcnow()
+    updated = exam.model_copy(update={**payload.model_dump(exclude_unset=True), "updated_at": datetime.utcnow()})
     db.update_exam(updated)
     return updated
 
@@ -4,7 +4,9 @@ from typing import List, Optional
 
 from fastapi import HTTPException, status
 
-from app.db.session import Database, get_db
+from app.db.pagination import next_cursor, resolve_sort_field
+from app.db.session import SUBJECT_SORT_FIELDS, Database, get_db
+from app.services.pagination import parse_cursor
 from app.schemas.master import (
     PaginatedSubjects,
     SubjectCreate,
@@ -61,8 +63,14 @@ def list_subjects(
     limit: int = 50,
     sort_by: str = "name",
     sort_order: str = "asc",
+    cursor: Optional[str] = None,
 ) -> PaginatedSubjects:
-    """Return subjects with filters and pagination."""
+    """
+    Return subjects with filters and pagination.
+
+    Pass the previous page's next_cursor to continue after it (keyset pagination);
+    skip is still honoured when no cursor is given but is deprecated.
+    """
 
     db = db or get_db()
     items, total = db.list_subjects(
@@ -73,9 +81,18 @@ def list_subjects(
         limit=limit,
         sort_by=sort_by,
         sort_order=sort_order,
-        include_total=True,
+        # Counting is a separate pass over every match; only the first page reports the total.
+        include_total=cursor is None,
+        cursor=parse_cursor(cursor),
+    )
+    sort_field = resolve_sort_field(sort_by, SUBJECT_SORT_FIELDS)
+    return PaginatedSubjects(
+        items=items,
+        total=total,
+        skip=skip,
+        limit=limit,
+        next_cursor=next_cursor(items, limit, sort_field, "id"),
     )
-    return PaginatedSubjects(items=items, total=total, skip=skip, limit=limit)
 
 
 def update_subject(subject_id: str, payload: SubjectUpdate, db: Optional[Database] = None) -> SubjectResponse:
@@ -89,8 +106,7 @@ def update_subject(subject_id: str, payload: SubjectUpdate, db: Optional[Databas
         if existing and existing.id != subject_id:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Subject slug already exists")
 
-    updated = subject.copy(update={k: v for k, v in payload.dict(exclude_unset=True).items()})
-    updated.updated_at = datetime.utcnow()
+    updated = subject.model_copy(update={**payload.model_dump(exclude_unset=True), "updated_at": datetime.utcnow()})
     db.update_subject(updated)
     return updated
 
@@ -101,7 +117,7 @@ def delete_subject(subject_id: str, db: Optional[Database] = None) -> None:
     db = db or get_db()
     if not db.get_subject(subject_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Subject not found")
-    if any(topic.subject_id == subject_id for topic in db.list_topics()):
+    if db.has_topics_for_subject(subject_id):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot delete subject with existing topics. Delete topics first.",
@@ -112,8 +128,9 @@ def delete_subject(subject_id: str, db: Optional[Database] = None) -> None:
 def _validate_topic_references(topic: TopicResponse, db: Database, ref_ids: List[str]) -> None:
     """Ensure referenced topics exist within the same subject."""
 
+    ref_topics = db.get_topics_by_ids(ref_ids)
     for ref_id in ref_ids:
-        ref_topic = db.get_topic(ref_id)
+        ref_topic = ref_topics.get(ref_id)
         if not ref_topic:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail=f"Referenced topic {ref_id} not found"
@@ -156,8 +173,7 @@ def create_topic(topic: TopicCreate, db: Optional[Database] = None) -> TopicResp
         created_at=now,
         updated_at=now,
     )
-    _validate_topic_references(created, db, created.related_topic_ids)
-    _validate_topic_references(created, db, created.prerequisite_topic_ids)
+    _validate_topic_references(created, db, created.related_topic_ids + created.prerequisite_topic_ids)
 
     db.insert_topic(created)
     return created
@@ -197,14 +213,13 @@ def update_topic(topic_id: str, payload: TopicUpdate, db: Optional[Database] = N
             status_code=status.HTTP_400_BAD_REQUEST, detail="Changing subject of a topic is not allowed"
         )
 
-    updated = topic.copy(update={k: v for k, v in payload.dict(exclude_unset=True).items()})
-    if updated.related_topic_ids is None:
-        updated.related_topic_ids = []
-    if updated.prerequisite_topic_ids is None:
-        updated.prerequisite_topic_ids = []
-    _validate_topic_references(updated, db, updated.related_topic_ids)
-    _validate_topic_references(updated, db, updated.prerequisite_topic_ids)
-    updated.updated_at = datetime.utcnow()
+    update_data = payload.model_dump(exclude_unset=True)
+    for field in ("related_topic_ids", "prerequisite_topic_ids"):
+        if update_data.get(field, getattr(topic, field)) is None:
+            update_data[field] = []
+    update_data["updated_at"] = datetime.utcnow()
+    updated = topic.model_copy(update=update_data)
+    _validate_topic_references(updated, db, updated.related_topic_ids + updated.prerequisite_topic_ids)
 
     db.update_topic(updated)
     return updated
@@ -0,0 +1,16 @@
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from app.db.pagination import Cursor
+
+
+def parse_cursor(token: Optional[str]) -> Optional[Cursor]:
+    """Decode a client-supplied pagination cursor, rejecting malformed tokens with 400."""
+
+    if not token:
+        return None
+    try:
+        return Cursor.decode(token)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
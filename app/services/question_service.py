@@ -1,17 +1,17 @@
-import random
 import uuid
 from datetime import datetime
+from itertools import chain
 from typing import Dict, List, Optional, Tuple
 
 from fastapi import HTTPException, status
 
-from app.db.questions_repo import QuestionRepo, get_question_repo
+from app.db.pagination import keyset_filter, next_cursor
+from app.db.questions_repo import QuestionRepo, get_question_repo, new_rand_key
 from app.schemas.question_doc import (
     AnswerKey,
     AnswerKeyType,
     PaginatedQuestions,
     QuestionDocCreate,
-    QuestionDocResponse,
     QuestionDocType,
     QuestionDocUpdate,
     QuestionFullView,
@@ -19,13 +19,18 @@ from app.schemas.question_doc import (
     QuestionPreviewView,
     UsageStatus,
 )
+from app.services.pagination import parse_cursor
 
 SCHEMA_VERSION = 2
+# Shorter search strings match too broadly to be worth a text-index scan.
+MIN_SEARCH_LENGTH = 3
 
 # Projection helpers
 PUBLIC_PROJECTION = {
     "search_blob": 0,
     "rand_key": 0,
+    "answer_key": 0,
+    "solution": 0,
 }
 PREVIEW_PROJECTION = {
     "search_blob": 0,
@@ -41,17 +46,17 @@ FULL_PROJECTION = {
 def _build_search_blob(payload: dict) -> str:
     """Create a normalized blob for text search."""
 
-    parts: List[str] = []
-    parts.append(payload.get("text", ""))
-    for opt in payload.get("options", []):
-        parts.append(opt.get("text", ""))
-    parts.extend(payload.get("tags", []))
     taxonomy = payload.get("taxonomy", {})
-    parts.append(taxonomy.get("subject_id") or "")
-    parts.extend(taxonomy.get("topic_ids", []))
-    parts.extend(taxonomy.get("target_exam_ids", []))
-    blob = " ".join(parts)
-    return " ".join(blob.lower().split())
+    parts = chain(
+        (payload.get("text", ""),),
+        (opt.get("text", "") for opt in payload.get("options", [])),
+        payload.get("tags", []),
+        (taxonomy.get("subject_id") or "",),
+        taxonomy.get("topic_ids", []),
+        taxonomy.get("target_exam_ids", []),
+    )
+    # Lower-case once over the joined text, then collapse runs of whitespace.
+    return " ".join(" ".join(parts).lower().split())
 
 
 def _validate_answer_key(question_type: QuestionDocType, answer_key: AnswerKey, options: List[Dict]) -> None:
@@ -133,7 +138,7 @@ def create_question(data: QuestionDocCreate, repo: Optional[QuestionRepo] = None
             "search_blob": _build_search_blob(payload),
             "created_at": now,
             "updated_at": now,
-            "rand_key": random.random(),
+            "rand_key": new_rand_key(),
             "schema_version": SCHEMA_VERSION,
         }
     )
@@ -173,7 +178,7 @@ def get_question(
     include_solution: bool = False,
     include_answer_key: bool = False,
     repo: Optional[QuestionRepo] = None,
-) -> QuestionDocResponse:
+) -> QuestionPublicView:
     repo = repo or get_question_repo()
     projection = dict(FULL_PROJECTION)
     if include_solution:
@@ -245,8 +250,17 @@ def discover_questions(
     limit: int = 20,
     sort_by: str = "created_at",
     sort_order: str = "desc",
+    cursor: Optional[str] = None,
     repo: Optional[QuestionRepo] = None,
 ) -> PaginatedQuestions:
+    """
+    Filtered, paginated question listing.
+
+    Without search, pass the previous page's next_cursor to continue after it (keyset
+    pagination); skip still works but is deprecated. Relevance-ranked search results
+    have no stable keyset and keep offset paging.
+    """
+
     repo = repo or get_question_repo()
     allowed_sorts = {"created_at", "difficulty", "updated_at"}
     if sort_by not in allowed_sorts:
@@ -255,6 +269,9 @@ def discover_questions(
         sort_order = "desc"
     skip = max(0, skip)
     limit = max(0, min(limit, 200))
+    search = " ".join(search.split()) if search else None
+    if search and len(search) < MIN_SEARCH_LENGTH and not cursor:
+        return PaginatedQuestions(items=[], total=0, skip=skip, limit=limit)
     filters = _build_filters(
         subject_id=subject_id,
         topic_ids=topic_ids,
@@ -271,7 +288,9 @@ def discover_questions(
     sort: List[Tuple[str, int]] = []
 
     if search:
-        docs = repo.find_many(
+        if cursor:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="cursor is not supported with search")
+        docs, total = repo.find_many_with_count(
             filters,
             projection=projection,
             sort=[("created_at", -1), ("_id", 1)],
@@ -280,13 +299,23 @@ def discover_questions(
             search=search,
             include_score=True,
         )
-        total = repo.count(filters, search=search)
     else:
         direction = -1 if sort_order == "desc" else 1
         sort.append((sort_by, direction))
-        sort.append(("_id", 1))
-        docs = repo.find_many(filters, projection=projection, sort=sort, skip=skip, limit=limit)
-        total = repo.count(filters)
+        sort.append(("_id", direction))
+        after = parse_cursor(cursor)
+        if after is not None:
+            docs, total = repo.find_many_with_count(
+                filters,
+                projection=projection,
+                sort=sort,
+                limit=limit,
+                page_filter=keyset_filter(after, sort_by, direction, "_id"),
+                # The first page already reported the total; recounting every match per page is wasted work.
+                include_total=False,
+            )
+        else:
+            docs, total = repo.find_many_with_count(filters, projection=projection, sort=sort, skip=skip, limit=limit)
     items: List[QuestionPublicView] = []
     for doc in docs:
         try:
@@ -294,8 +323,10 @@ def discover_questions(
         except Exception:
             # Skip documents that do not match the v2 schema (e.g., legacy records)
             continue
-    total = total if total else len(items)
-    return PaginatedQuestions(items=items, total=total, skip=skip, limit=limit)
+    if total is not None:
+        total = total if total else len(items)
+    cursor_out = None if search else next_cursor(docs, limit, sort_by, "_id")
+    return PaginatedQuestions(items=items, total=total, skip=skip, limit=limit, next_cursor=cursor_out)
 
 
 def sample_questions(
@@ -324,15 +355,9 @@ def sample_questions(
         is_active=is_active,
         include_legacy=True,
     )
-    projection = dict(PUBLIC_PROJECTION)
-    docs = repo.sample(filters=filters, limit=limit, seed=seed)
-    # apply projection for sample (since repo.sample may not project)
-    projected: List[Dict] = []
-    for doc in docs:
-        projected_doc = {k: v for k, v in doc.items() if k not in projection}
-        projected.append(projected_doc)
+    docs = repo.sample(filters=filters, limit=limit, seed=seed, projection=dict(PUBLIC_PROJECTION))
     items: List[QuestionPublicView] = []
-    for doc in projected:
+    for doc in docs:
         try:
             items.append(QuestionPublicView(**doc))
         except Exception:
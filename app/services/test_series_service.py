@@ -4,7 +4,8 @@ from typing import List, Optional
 
 from fastapi import HTTPException, status
 
-from app.db.session import Database, get_db
+from app.db.pagination import next_cursor, resolve_sort_field
+from app.db.session import TEST_SERIES_SORT_FIELDS, Database, get_db
 from app.schemas.test_series import (
     PaginatedTestSeries,
     SeriesStatus,
@@ -13,15 +14,17 @@ from app.schemas.test_series import (
     TestSeriesResponse,
     TestSeriesUpdate,
 )
+from app.services.pagination import parse_cursor
 
 
 def _validate_syllabus_coverage(items: List[SyllabusCoverageItem], db: Database) -> None:
+    subjects = db.get_subjects_by_ids(item.subject_id for item in items)
+    topics = db.get_topics_by_ids(topic_id for item in items for topic_id in item.topic_ids)
     for item in items:
-        subject = db.get_subject(item.subject_id)
-        if not subject:
+        if item.subject_id not in subjects:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Subject {item.subject_id} not found")
         for topic_id in item.topic_ids:
-            topic = db.get_topic(topic_id)
+            topic = topics.get(topic_id)
             if not topic:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Topic {topic_id} not found")
             if topic.subject_id != item.subject_id:
@@ -84,6 +87,7 @@ def list_test_series(
     limit: int = 50,
     sort_by: str = "display_order",
     sort_order: str = "asc",
+    cursor: Optional[str] = None,
 ) -> PaginatedTestSeries:
     db = db or get_db()
     items, total = db.list_test_series(
@@ -100,9 +104,18 @@ def list_test_series(
         limit=limit,
         sort_by=sort_by,
         sort_order=sort_order,
-        include_total=True,
+        # Counting is a separate pass over every match; only the first page reports the total.
+        include_total=cursor is None,
+        cursor=parse_cursor(cursor),
+    )
+    sort_field = resolve_sort_field(sort_by, TEST_SERIES_SORT_FIELDS)
+    return PaginatedTestSeries(
+        items=items,
+        total=total,
+        skip=skip,
+        limit=limit,
+        next_cursor=next_cursor(items, limit, sort_field, "series_id"),
     )
-    return PaginatedTestSeries(items=items, total=total, skip=skip, limit=limit)
 
 
 def update_test_series(series_id: str, payload: TestSeriesUpdate, db: Optional[Database] = None) -> TestSeriesResponse:
@@ -113,12 +126,11 @@ def update_test_series(series_id: str, payload: TestSeriesUpdate, db: Optional[D
     if "code" in update_data:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot modify code")
 
-    merged = existing.copy(update=update_data)
+    merged = existing.model_copy(update={**update_data, "updated_at": datetime.utcnow()})
 
     if merged.syllabus_coverage:
         _validate_syllabus_coverage(merged.syllabus_coverage, db)
 
-    merged.updated_at = datetime.utcnow()
     db.update_test_series(merged)
     return merged
 
@@ -127,12 +139,12 @@ def update_test_series_status(series_id: str, status_value: str, db: Optional[Da
     db = db or get_db()
     existing = get_test_series(series_id, db)
     try:
-        existing.status = SeriesStatus(status_value)
+        new_status = SeriesStatus(status_value)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status value")
-    existing.updated_at = datetime.utcnow()
-    db.update_test_series(existing)
-    return existing
+    updated = existing.model_copy(update={"status": new_status, "updated_at": datetime.utcnow()})
+    db.update_test_series(updated)
+    return updated
 
 
 def delete_test_series(series_id: str, db: Optional[Database] = None) -> None:
@@ -5,7 +5,8 @@ from typing import Dict, List, Optional
 
 from fastapi import HTTPException, status
 
-from app.db.session import Database, get_db
+from app.db.pagination import next_cursor, resolve_sort_field
+from app.db.session import TEST_SORT_FIELDS, Database, get_db
 from app.schemas.master import SubjectResponse
 from app.schemas.question import QuestionResponse, QuestionType
 from app.schemas.test import (
@@ -25,6 +26,7 @@ from app.schemas.test import (
     ValidationResult,
     TestSection,
 )
+from app.services.pagination import parse_cursor
 
 
 def _get_test(test_id: str, db: Database) -> TestResponse:
@@ -55,12 +57,12 @@ def _ensure_series_exists(series_id: Optional[str], db: Database) -> None:
 
 def _validate_sections(pattern, db: Database) -> None:
     section_ids = set()
+    subjects: Dict[str, SubjectResponse] = db.get_subjects_by_ids(section.subject_id for section in pattern.sections)
     for section in pattern.sections:
         if section.section_id in section_ids:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Duplicate section_id in pattern")
         section_ids.add(section.section_id)
-        subject: Optional[SubjectResponse] = db.get_subject(section.subject_id)
-        if not subject:
+        if section.subject_id not in subjects:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Subject {section.subject_id} not found for section {section.section_id}",
@@ -74,12 +76,13 @@ def _validate_sections(pattern, db: Database) -> None:
 
 
 def _ensure_test_uniques(code: str, slug: str, series_id: Optional[str], test_number: Optional[int], db: Database) -> None:
-    if db.get_test_by_code(code):
+    conflicts = db.find_test_conflicts(code, slug, series_id, test_number)
+    if any(t.get("code") == code for t in conflicts):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Test code already exists")
-    if db.get_test_by_slug(slug):
+    if any(t.get("slug") == slug for t in conflicts):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Test slug already exists")
     if series_id and test_number is not None:
-        if db.get_test_by_series_and_number(series_id, test_number):
+        if any(t.get("series_id") == series_id and t.get("test_number") == test_number for t in conflicts):
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="test_number already exists in series")
 
 
@@ -193,6 +196,7 @@ def list_tests(
     include_questions: bool = True,
     sort_by: str = "test_number",
     sort_order: str = "asc",
+    cursor: Optional[str] = None,
 ) -> PaginatedTests:
     db = db or get_db()
     items, total = db.list_tests(
@@ -204,22 +208,32 @@ def list_tests(
         include_questions=include_questions,
         sort_by=sort_by,
         sort_order=sort_order,
-        include_total=True,
+        # Counting is a separate pass over every match; only the first page reports the total.
+        include_total=cursor is None,
+        cursor=parse_cursor(cursor),
+    )
+    sort_field = resolve_sort_field(sort_by, TEST_SORT_FIELDS)
+    return PaginatedTests(
+        items=items,
+        total=total,
+        skip=skip,
+        limit=limit,
+        next_cursor=next_cursor(items, limit, sort_field, "test_id"),
     )
-    return PaginatedTests(items=items, total=total, skip=skip, limit=limit)
 
 
 def update_test(test_id: str, payload: TestUpdate, db: Optional[Database] = None) -> TestResponse:
     db = db or get_db()
     existing = _get_test(test_id, db)
-    update_data = payload.model_dump(exclude_unset=True)
+    # Keep nested values as models (not dumped dicts) so the merged test validates and serializes.
+    update_data = {field: getattr(payload, field) for field in payload.model_fields_set}
     if "series_id" in update_data or "test_number" in update_data or "test_id" in update_data:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot modify identifiers (series_id, test_number, test_id)",
         )
 
-    merged = existing.copy(update=update_data)
+    merged = existing.model_copy(update={**update_data, "updated_at": datetime.utcnow()})
     if merged.pattern:
         _validate_sections(merged.pattern, db)
         section_ids = {s.section_id for s in merged.pattern.sections}
@@ -230,8 +244,7 @@ def update_test(test_id: str, payload: TestUpdate, db: Optional[Database] = None
                     detail=f"Question {question.question_id} belongs to removed section {question.section_id}",
                 )
     _basic_question_set_checks(merged)
-    merged.updated_at = datetime.utcnow()
-    db.update_test(merged)
+    db.update_test_fields(merged, update_data.keys())
     return merged
 
 
@@ -242,15 +255,17 @@ def delete_test(test_id: str, db: Optional[Database] = None) -> None:
 
 
 def _fetch_questions_or_fail(question_ids: List[str], db: Database) -> List[QuestionResponse]:
-    found = db.get_questions_by_ids(question_ids)
-    found_ids = {q.question_id for q in found}
-    missing = [qid for qid in question_ids if qid not in found_ids]
+    """Load questions with a single $in query, returned in request order (duplicates collapsed)."""
+
+    by_id = {q.question_id: q for q in db.get_questions_by_ids(question_ids)}
+    ordered_ids = list(dict.fromkeys(question_ids))
+    missing = [qid for qid in ordered_ids if qid not in by_id]
     if missing:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Questions not found: {missing}",
         )
-    return found
+    return [by_id[qid] for qid in ordered_ids]
 
 
 def _next_seq(questions: List[QuestionReference]) -> int:
@@ -303,9 +318,8 @@ def add_questions_to_test(test_id: str, payload: AddQuestionsRequest, db: Option
 
     _ensure_sequences_contiguous(updated_questions)
 
-    test.questions = updated_questions
-    test.updated_at = datetime.utcnow()
-    db.update_test(test)
+    test = test.model_copy(update={"questions": updated_questions, "updated_at": datetime.utcnow()})
+    db.update_test_fields(test, {"questions"})
     return new_refs
 
 
@@ -373,9 +387,8 @@ def bulk_add_questions(test_id: str, payload: BulkAddRequest, db: Optional[Datab
     updated_questions = sorted(test.questions + new_refs, key=lambda q: q.seq)
     _ensure_sequences_contiguous(updated_questions)
 
-    test.questions = updated_questions
-    test.updated_at = datetime.utcnow()
-    db.update_test(test)
+    test = test.model_copy(update={"questions": updated_questions, "updated_at": datetime.utcnow()})
+    db.update_test_fields(test, {"questions"})
     return new_refs
 
 
@@ -384,14 +397,12 @@ def remove_question(test_id: str, question_id: str, db: Optional[Database] = Non
     test = _get_test(test_id, db)
     if question_id not in {q.question_id for q in test.questions}:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Question not found in test")
-    test.questions = [q for q in test.questions if q.question_id != question_id]
+    remaining = sorted((q for q in test.questions if q.question_id != question_id), key=lambda q: q.seq)
     # Resequence to keep contiguous order
-    test.questions = sorted(test.questions, key=lambda q: q.seq)
-    for idx, ref in enumerate(test.questions, start=1):
-        ref.seq = idx
-    _ensure_sequences_contiguous(test.questions)
-    test.updated_at = datetime.utcnow()
-    db.update_test(test)
+    remaining = [ref.model_copy(update={"seq": idx}) for idx, ref in enumerate(remaining, start=1)]
+    _ensure_sequences_contiguous(remaining)
+    test = test.model_copy(update={"questions": remaining, "updated_at": datetime.utcnow()})
+    db.update_test_fields(test, {"questions"})
 
 
 def reorder_questions(test_id: str, payload: ReorderRequest, db: Optional[Database] = None) -> List[QuestionReference]:
@@ -400,6 +411,7 @@ def reorder_questions(test_id: str, payload: ReorderRequest, db: Optional[Databa
     section = _get_section(test, payload.section_id)
     updates = payload.question_sequence
     question_map = {q.question_id: q for q in test.questions}
+    new_seqs: Dict[str, int] = {}
     for item in updates:
         qid = item.get("question_id") or item.get("id")
         seq = item.get("seq")
@@ -415,15 +427,18 @@ def reorder_questions(test_id: str, payload: ReorderRequest, db: Optional[Databa
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Question {qid} does not belong to section {section.section_id}",
             )
-        ref.seq = int(seq)
+        new_seqs[qid] = int(seq)
 
+    questions = [
+        q.model_copy(update={"seq": new_seqs[q.question_id]}) if q.question_id in new_seqs else q for q in test.questions
+    ]
     # Ensure no duplicate seq values
-    seqs = [q.seq for q in test.questions]
+    seqs = [q.seq for q in questions]
     if len(seqs) != len(set(seqs)):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Duplicate sequence numbers not allowed")
-    _ensure_sequences_contiguous(test.questions)
-    test.updated_at = datetime.utcnow()
-    db.update_test(test)
+    _ensure_sequences_contiguous(questions)
+    test = test.model_copy(update={"questions": questions, "updated_at": datetime.utcnow()})
+    db.update_test_fields(test, {"questions"})
     return sorted(test.questions, key=lambda q: q.seq)
 
 
@@ -454,14 +469,12 @@ def replace_question(
         is_optional=ref.is_optional,
     )
     # Replace
-    for idx, q in enumerate(test.questions):
-        if q.question_id == old_question_id:
-            test.questions[idx] = new_ref
-            break
-    test.questions = sorted(test.questions, key=lambda q: q.seq)
-    _ensure_sequences_contiguous(test.questions)
-    test.updated_at = datetime.utcnow()
-    db.update_test(test)
+    questions = sorted(
+        (new_ref if q.question_id == old_question_id else q for q in test.questions), key=lambda q: q.seq
+    )
+    _ensure_sequences_contiguous(questions)
+    test = test.model_copy(update={"questions": questions, "updated_at": datetime.utcnow()})
+    db.update_test_fields(test, {"questions"})
     return new_ref
 
 
@@ -474,11 +487,8 @@ def update_question_marks(
     if not ref:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Question not found in test")
     data = payload.model_dump(exclude_unset=True)
-    for field, value in data.items():
-        setattr(ref, field, value)
-    test.updated_at = datetime.utcnow()
-    db.update_test(test)
-    return ref
+    db.update_test_question(test_id, question_id, data, datetime.utcnow())
+    return ref.model_copy(update=data)
 
 
 def _build_question_map(question_ids: List[str], db: Database) -> Dict[str, QuestionResponse]:
@@ -499,6 +509,9 @@ def _ensure_solutions_released(test: TestResponse) -> None:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Solutions require manual release")
 
 
+_ANSWER_FIELDS = {"correct_option_id", "correct_option_ids", "answer_value", "solution"}
+
+
 def get_test_preview(test_id: str, db: Optional[Database] = None) -> dict:
     db = db or get_db()
     test = _get_test(test_id, db)
@@ -511,12 +524,11 @@ def get_test_preview(test_id: str, db: Optional[Database] = None) -> dict:
     merged_questions = []
     for ref in sorted(test.questions, key=lambda q: q.seq):
         q = q_map[ref.question_id]
-        q_data = q.model_dump()
-        for ans_field in ("correct_option_id", "correct_option_ids", "answer_value", "solution"):
-            q_data.pop(ans_field, None)
+        q_data = q.model_dump(exclude=_ANSWER_FIELDS)
         merged_questions.append({**ref.model_dump(), **q_data})
 
-    response = test.model_dump()
+    # The reference list is replaced by the merged view, so skip dumping it.
+    response = test.model_dump(exclude={"questions"})
     response["questions"] = merged_questions
     return response
 
@@ -533,7 +545,8 @@ def get_test_with_solutions(test_id: str, db: Optional[Database] = None) -> dict
     for ref in sorted(test.questions, key=lambda q: q.seq):
         q = q_map[ref.question_id]
         merged_questions.append({**ref.model_dump(), **q.model_dump()})
-    response = test.model_dump()
+    # The reference list is replaced by the merged view, so skip dumping it.
+    response = test.model_dump(exclude={"questions"})
     response["questions"] = merged_questions
     return response
 
@@ -0,0 +1,149 @@
+import os
+import re
+from mimetypes import guess_type
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+# Preference order for build-time compressed siblings (styles.css.br, styles.css.gz).
+PRECOMPRESSED_ENCODINGS: Tuple[Tuple[str, str], ...] = (("br", ".br"), ("gzip", ".gz"))
+# Build tools put a content hash in the name (app.3f2a9c1b.js, main-5d1e2f3a9b.css); such a URL never
+# changes content, so browsers may keep it without revalidating.
+FINGERPRINTED_NAME = re.compile(r"[.-][0-9a-f]{8,}\.[0-9A-Za-z]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class AssetFile(NamedTuple):
+    path: str
+    stat_result: os.stat_result
+    etag: str
+
+
+class StaticAsset(NamedTuple):
+    identity: AssetFile
+    media_type: str
+    cache_control: Optional[str]
+    variants: Dict[str, AssetFile]  # content coding -> precompressed sibling
+
+
+def accepted_encodings(accept_encoding: str) -> List[str]:
+    """Return the content codings named in an Accept-Encoding header, skipping any refused with q=0."""
+
+    accepted = []
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q=") and params[2:].strip("0.") == "":
+            continue
+        if coding.strip():
+            accepted.append(coding.strip().lower())
+    return accepted
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag (RFC 9110 §13.1.2)."""
+
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip() == "*" or tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
+
+
+def _asset_file(path: str) -> AssetFile:
+    stat_result = os.stat(path)
+    return AssetFile(path, stat_result, f'W/"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"')
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles that indexes its directory once at startup and serves each file with a weak ETag,
+    Cache-Control, and the best `.br`/`.gz` sibling the client accepts.
+
+    Indexed files are answered without touching the filesystem until the body is streamed, and a
+    matching If-None-Match returns 304 straight from the index. Files added after startup fall back to
+    the regular StaticFiles lookup; replacing an indexed file in place needs a restart, as any deploy does.
+    Precompressed responses already carry Content-Encoding, so GZipMiddleware passes them through.
+    """
+
+    def __init__(self, *args, cache_control: Optional[str] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.cache_control = cache_control
+        self._root = os.path.realpath(self.directory) if self.directory is not None else None
+        self._index = self._build_index()
+
+    def _build_index(self) -> Dict[str, StaticAsset]:
+        index: Dict[str, StaticAsset] = {}
+        if self._root is None or not os.path.isdir(self._root):
+            return index
+        for dirpath, _, filenames in os.walk(self._root):
+            names = set(filenames)
+            for name in filenames:
+                if name.endswith((".br", ".gz")) and name[:-3] in names:
+                    continue
+                full_path = os.path.join(dirpath, name)
+                real_path = os.path.realpath(full_path)
+                if not self.follow_symlink and os.path.commonpath([real_path, self._root]) != self._root:
+                    continue
+                variants = {
+                    encoding: _asset_file(full_path + suffix)
+                    for encoding, suffix in PRECOMPRESSED_ENCODINGS
+                    if name + suffix in names
+                }
+                cache_control = IMMUTABLE_CACHE_CONTROL if FINGERPRINTED_NAME.search(name) else self.cache_control
+                index[os.path.relpath(full_path, self._root)] = StaticAsset(
+                    identity=_asset_file(full_path),
+                    media_type=guess_type(name)[0] or "text/plain",
+                    cache_control=cache_control,
+                    variants=variants,
+                )
+        return index
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        asset = self._index.get(path) if scope["method"] in ("GET", "HEAD") else None
+        if asset is None:
+            return await super().get_response(path, scope)
+        return self._asset_response(asset, scope)
+
+    def file_response(
+        self,
+        full_path: os.PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        # Reached for directory index.html, html-mode 404 pages and files added after startup.
+        asset = None
+        if self._root is not None and status_code == 200:
+            asset = self._index.get(os.path.relpath(os.fspath(full_path), self._root))
+        if asset is not None:
+            return self._asset_response(asset, scope)
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if self.cache_control:
+            response.headers["Cache-Control"] = self.cache_control
+        return response
+
+    def _asset_response(self, asset: StaticAsset, scope: Scope) -> Response:
+        request_headers = Headers(scope=scope)
+        file, encoding = asset.identity, None
+        if asset.variants:
+            accepted = accepted_encodings(request_headers.get("accept-encoding", ""))
+            for candidate, _ in PRECOMPRESSED_ENCODINGS:
+                if candidate in accepted and candidate in asset.variants:
+                    file, encoding = asset.variants[candidate], candidate
+                    break
+
+        headers = {"ETag": file.etag}
+        if asset.cache_control:
+            headers["Cache-Control"] = asset.cache_control
+        if asset.variants:
+            headers["Vary"] = "Accept-Encoding"
+        if etag_matches(request_headers.get("if-none-match"), file.etag):
+            return NotModifiedResponse(Headers(headers))
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return FileResponse(file.path, headers=headers, media_type=asset.media_type, stat_result=file.stat_result)
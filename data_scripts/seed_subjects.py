@@ -6,6 +6,7 @@ Seed ~45 real-world "subjects" directly into MongoDB (no API key required).
 - Generates clean slugs (e.g., "physics-class-9", "maths-class-11")
 - Inserts subjects via the Database repository (avoids HTTP/auth)
 - Skips subjects already present by slug
+- Looks up existing slugs with one query and inserts the rest in one batch
 
 How to run:
 1) Ensure MongoDB is reachable per your `.env` (MQDB_MONGO_URI/MQDB_MONGO_DB_NAME)
@@ -188,13 +189,14 @@ def main():
     db = Database()
     print(f"Seeding {len(subjects)} subjects directly into MongoDB database '{db.db_name}'\n")
 
-    inserted = 0
     skipped = 0
     now = datetime.utcnow()
+    existing = db.find_subject_slugs(subj["slug"] for subj in subjects)
+    new_subjects: List[SubjectResponse] = []
 
     for i, subj in enumerate(subjects, start=1):
         slug = subj["slug"]
-        if db.get_subject_by_slug(slug):
+        if slug in existing:
             skipped += 1
             print(f"[{i:02d}/{len(subjects)}] ↷ SKIP  slug={slug}  (already exists)")
             continue
@@ -210,12 +212,13 @@ def main():
             created_at=now,
             updated_at=now,
         )
-        db.insert_subject(subject_doc)
-        inserted += 1
+        new_subjects.append(subject_doc)
+        existing.add(slug)
         print(f"[{i:02d}/{len(subjects)}] ✅ OK   slug={slug}")
 
+    db.insert_subjects(new_subjects)
     print("\nDone.")
-    print(f"Inserted: {inserted}")
+    print(f"Inserted: {len(new_subjects)}")
     print(f"Skipped (existing): {skipped}")
 
 
@@ -0,0 +1,85 @@
+from typing import Dict, Tuple
+
+import pytest
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+import app.api.v1.caching as caching
+from app.api.v1.caching import ResponseCache, cached_response, invalidate_on_write
+
+
+@pytest.fixture
+def client_and_loads(monkeypatch) -> Tuple[TestClient, Dict[str, int]]:
+    """App with one cached GET and one write route, backed by a fresh in-process cache."""
+
+    monkeypatch.setattr(caching, "get_redis", lambda: None)
+    monkeypatch.setattr(caching, "response_cache", ResponseCache(ttl_seconds=60))
+    loads: Dict[str, int] = {"count": 0}
+
+    async def load() -> dict:
+        loads["count"] += 1
+        return {"version": loads["count"]}
+
+    router = APIRouter(dependencies=[Depends(invalidate_on_write)])
+
+    @router.get("/items")
+    async def list_items(request: Request):
+        return await cached_response(request, load)
+
+    @router.post("/items")
+    async def create_item() -> dict:
+        return {"status": "created"}
+
+    @router.put("/items")
+    async def update_items_then_fail() -> dict:
+        raise HTTPException(status_code=422, detail="rejected after a partial update")
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app), loads
+
+
+def test_etag_round_trip_returns_304(client_and_loads) -> None:
+    client, loads = client_and_loads
+
+    first = client.get("/items")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    not_modified = client.get("/items", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+    assert client.get("/items", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+    assert loads["count"] == 1
+
+
+def test_write_invalidates_cached_body(client_and_loads) -> None:
+    client, loads = client_and_loads
+
+    assert client.get("/items").json() == {"version": 1}
+    assert client.get("/items").json() == {"version": 1}
+
+    assert client.post("/items").status_code == 200
+    assert client.get("/items").json() == {"version": 2}
+    assert loads["count"] == 2
+
+
+def test_query_parameter_order_shares_one_entry(client_and_loads) -> None:
+    client, loads = client_and_loads
+
+    first = client.get("/items?status=published&limit=20")
+    second = client.get("/items?limit=20&status=published")
+    assert first.headers["etag"] == second.headers["etag"]
+    assert loads["count"] == 1
+
+    client.get("/items?limit=10&status=published")
+    assert loads["count"] == 2
+
+
+def test_failed_write_still_invalidates(client_and_loads) -> None:
+    client, loads = client_and_loads
+
+    assert client.get("/items").json() == {"version": 1}
+    assert client.put("/items").status_code == 422
+    assert client.get("/items").json() == {"version": 2}
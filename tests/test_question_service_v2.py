@@ -1,3 +1,6 @@
+import base64
+
+import orjson
 import pytest
 from fastapi import HTTPException
 
@@ -61,6 +64,39 @@ def test_discover_filters_by_subject_and_difficulty():
     assert result.items[0].taxonomy.subject_id == "math"
 
 
+def test_discover_cursor_pages_through_results():
+    repo = InMemoryQuestionRepo()
+    for difficulty in (1, 2, 2, 3, 4):
+        create_question(_base_payload(difficulty=difficulty), repo=repo)
+
+    seen = []
+    cursor = None
+    while True:
+        page = discover_questions(sort_by="difficulty", sort_order="asc", limit=2, cursor=cursor, repo=repo)
+        seen.extend(item.question_id for item in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen)) == 5
+    assert [repo.storage[qid]["difficulty"] for qid in seen] == [1, 2, 2, 3, 4]
+
+    with pytest.raises(HTTPException):
+        discover_questions(cursor="not-a-cursor", repo=repo)
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [{"v": {"$where": "1"}, "id": "x"}, {"v": 1, "id": {"$ne": None}}, {"v": [1], "id": "x"}],
+)
+def test_discover_rejects_operator_cursor(payload):
+    token = base64.urlsafe_b64encode(orjson.dumps(payload)).decode("ascii").rstrip("=")
+
+    with pytest.raises(HTTPException) as exc_info:
+        discover_questions(cursor=token, repo=InMemoryQuestionRepo())
+    assert exc_info.value.status_code == 400
+
+
 def test_sample_deterministic_with_seed():
     repo = InMemoryQuestionRepo()
     for idx in range(3):
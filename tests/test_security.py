@@ -9,13 +9,15 @@ from fastapi.testclient import TestClient
 from app.api.v1.endpoints.security import admin_guard
 from app.core.config import get_settings
 from app.security.api_keys import (
+    MAX_API_KEY_LENGTH,
     _api_key_store,
     _salt,
     generate_api_key,
+    is_raw_key_valid,
     register_api_key,
     require_api_key,
 )
-from app.security.rate_limit import RateLimiter
+from app.security.rate_limit import RateLimiter, RateLimitMiddleware
 
 
 @pytest.fixture(autouse=True)
@@ -57,6 +59,27 @@ def test_api_key_verification_success_and_missing() -> None:
     assert resp_forbidden.status_code == 403
 
 
+def test_oversized_key_rejected_before_hashing(monkeypatch) -> None:
+    raw_key = "k" * (MAX_API_KEY_LENGTH + 1)
+    register_api_key(raw_key)
+
+    def fail_hash(_: str) -> str:
+        raise AssertionError("oversized key was hashed")
+
+    monkeypatch.setattr("app.security.api_keys.hash_api_key", fail_hash)
+    assert not is_raw_key_valid(raw_key)
+
+
+def test_only_registered_keys_are_valid() -> None:
+    raw_keys = [generate_api_key()[0] for _ in range(3)]
+    for raw_key in raw_keys:
+        register_api_key(raw_key)
+    unknown_key, _ = generate_api_key()
+
+    assert all(is_raw_key_valid(raw_key) for raw_key in raw_keys)
+    assert not is_raw_key_valid(unknown_key)
+
+
 def test_rate_limiter_enforces_limits() -> None:
     app = FastAPI()
     limiter = RateLimiter(limit=2, window_seconds=60)
@@ -72,6 +95,24 @@ def test_rate_limiter_enforces_limits() -> None:
     assert resp.status_code == 429
 
 
+def test_rate_limit_middleware_guards_prefixed_routes() -> None:
+    app = FastAPI()
+    app.add_middleware(
+        RateLimitMiddleware, limiter=RateLimiter(limit=1, window_seconds=60), prefix="/api", exempt=("/public/",)
+    )
+    app.get("/api/items")(lambda: {"ok": True})
+    app.get("/api/public/ping")(lambda: {"ok": True})
+
+    raw_key, _ = generate_api_key()
+    register_api_key(raw_key)
+    client = TestClient(app)
+
+    assert client.get("/api/items").status_code == 403
+    assert client.get("/api/items", headers={"X-API-Key": raw_key}).status_code == 200
+    assert client.get("/api/items", headers={"X-API-Key": raw_key}).status_code == 429
+    assert client.get("/api/public/ping").status_code == 200
+
+
 def test_admin_guard_allows_master_key() -> None:
     app = FastAPI()
 
@@ -89,3 +130,24 @@ def test_admin_guard_allows_master_key() -> None:
     # Without master/API key
     resp_forbidden = client.get("/admin-only")
     assert resp_forbidden.status_code == 403
+
+
+def test_rate_limiter_weights_previous_window(monkeypatch) -> None:
+    clock = [1019.0]  # one second before the 1020s window boundary
+    monkeypatch.setattr("app.security.rate_limit.time.time", lambda: clock[0])
+    limiter = RateLimiter(limit=2, window_seconds=60)
+
+    assert limiter.acquire("key")
+    assert limiter.acquire("key")
+    assert not limiter.acquire("key")
+
+    # Just past the boundary the previous window still counts almost fully,
+    # so a fresh fixed window's burst is not granted.
+    clock[0] = 1021.0
+    assert limiter.acquire("key")
+    assert not limiter.acquire("key")
+
+    # Two windows later nothing from the burst remains.
+    clock[0] = 1140.0
+    assert limiter.acquire("key")
+    assert limiter.acquire("key")
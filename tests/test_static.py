@@ -0,0 +1,69 @@
+from pathlib import Path
+from typing import Tuple
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.web.static import PrecompressedStaticFiles, accepted_encodings
+
+
+def test_accepted_encodings_skips_refused_codings() -> None:
+    assert accepted_encodings("br, gzip;q=0.8, deflate") == ["br", "gzip", "deflate"]
+    assert accepted_encodings("br;q=0, GZIP; q=0.5") == ["gzip"]
+    assert accepted_encodings("gzip;q=0.0, identity") == ["identity"]
+    assert accepted_encodings("") == []
+
+
+@pytest.fixture
+def client(tmp_path: Path) -> TestClient:
+    (tmp_path / "app.css").write_bytes(b"identity")
+    (tmp_path / "app.css.br").write_bytes(b"brotli")
+    (tmp_path / "app.css.gz").write_bytes(b"gzipped")
+    (tmp_path / "plain.txt").write_bytes(b"plain")
+    app = FastAPI()
+    app.mount("/static", PrecompressedStaticFiles(directory=str(tmp_path), cache_control="public, max-age=60"))
+    return TestClient(app)
+
+
+def _raw_get(client: TestClient, path: str, **headers: str) -> Tuple[httpx.Response, bytes]:
+    # Read the undecoded body so the test sees exactly which sibling was served.
+    with client.stream("GET", path, headers=headers) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_serves_best_accepted_precompressed_sibling(client: TestClient) -> None:
+    response, body = _raw_get(client, "/static/app.css", **{"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert body == b"brotli"
+
+    response, body = _raw_get(client, "/static/app.css", **{"Accept-Encoding": "br;q=0, gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert body == b"gzipped"
+
+    response, body = _raw_get(client, "/static/app.css", **{"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert body == b"identity"
+    assert response.headers["content-type"].startswith("text/css")
+
+
+def test_vary_etag_and_not_modified(client: TestClient) -> None:
+    response, _ = _raw_get(client, "/static/app.css", **{"Accept-Encoding": "br"})
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["cache-control"] == "public, max-age=60"
+    etag = response.headers["etag"]
+
+    not_modified, body = _raw_get(client, "/static/app.css", **{"Accept-Encoding": "br", "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert body == b""
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.headers["vary"] == "Accept-Encoding"
+
+    # The gzip sibling is a different representation, so the brotli ETag does not validate it.
+    response, _ = _raw_get(client, "/static/app.css", **{"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 200
+
+    plain, _ = _raw_get(client, "/static/plain.txt", **{"Accept-Encoding": "br"})
+    assert "vary" not in plain.headers
+    assert "content-encoding" not in plain.headers